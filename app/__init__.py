@@ -21,6 +21,14 @@ def create_app():
 
     # माइग्रेशन से संबंधित सभी कोड को यहाँ से हटा दिया गया है
 
+    # Structured logs (LOG_LEVEL env se level)
+    from .services import metrics
+    metrics.configure_logging()
+
+    # Database connection pool: har request ke end par connection pool mein wapas chala jata hai
+    from .services import db
+    db.init_app(app)
+
     # App ke routes (web pages) ko register karein
     from .routes import main_routes
     app.register_blueprint(main_routes.main_bp)
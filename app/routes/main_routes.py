@@ -1,29 +1,36 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, send_file
-from app.services import youtube_service
-import pandas as pd
-import io
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, Response, stream_with_context
+from app.services import db, job_queue, channel_queries, channel_stats, export_service, metrics
+from app.services.categories import CATEGORY_KEYWORDS
 from datetime import datetime, timedelta
 import json
 import threading
-
-# --- यह इम्पोर्ट केवल एक बार डेटाबेस सेटअप के लिए है ---
-from init_db import initialize_database
+import time
 
 main_bp = Blueprint('main', __name__)
 
+# Quota status har page aur har status poll par dikhta hai, isliye thodi der cache rehta hai
+QUOTA_STATUS_CACHE_TTL = 10
+_quota_status_cache = {'value': None, 'expires': 0.0}
+_quota_status_lock = threading.Lock()
+
+
 def get_quota_status_message():
-    conn = None
+    now = time.monotonic()
+    with _quota_status_lock:
+        if _quota_status_cache['expires'] > now:
+            return _quota_status_cache['value']
     try:
-        conn = youtube_service.get_db_connection()
-        cur = conn.cursor()
-        cur.execute("SELECT value FROM app_state WHERE key = 'quota_status'")
-        result = cur.fetchone()
-        return result[0] if result else None
+        conn = db.get_request_connection()
+        with conn.cursor() as cur:
+            cur.execute("SELECT value FROM app_state WHERE key = 'quota_status'")
+            result = cur.fetchone()
+        conn.rollback()
     except Exception:
         return None
-    finally:
-        if conn:
-            conn.close()
+    value = result[0] if result else None
+    with _quota_status_lock:
+        _quota_status_cache.update(value=value, expires=now + QUOTA_STATUS_CACHE_TTL)
+    return value
 
 @main_bp.route('/')
 def index():
@@ -41,16 +48,14 @@ def search():
         max_channels = int(request.form.get('max_channels', 100))
         require_contact = 'require_contact' in request.form
         
-        # NOTE: Production environments mein threading.Thread ka istemal na karein. 
-        # Iski jagah Celery ya RQ jaisa Task Queue istemal karein.
-        search_thread = threading.Thread(
-            target=youtube_service.find_channels,
-            args=(category, start_date, min_subs, max_subs, max_channels, require_contact)
-        )
-        search_thread.start()
-
-        flash("Channel search has been started in the background. Results will appear here shortly.", "success")
-        return redirect(url_for('main.loading'))
+        # Job ko queue mein daalte hain; worker.py ke processes ise uthakar chalayenge
+        job_id = job_queue.enqueue_job(db.get_request_connection(), 'find_channels', {
+            'category': category, 'date_after': start_date, 'min_subs': min_subs, 'max_subs': max_subs,
+            'max_channels_limit': max_channels, 'require_contact': require_contact
+        })
+
+        flash(f"Channel search job #{job_id} has been queued. Results will appear here shortly.", "success")
+        return redirect(url_for('main.loading', job_id=job_id))
         
     except Exception as e:
         flash(f"An error occurred while starting the search: {e}", "error")
@@ -66,75 +71,97 @@ def update_video_counts():
         if not channel_ids:
             return jsonify({'success': False, 'message': 'No channels selected.'})
 
-        # NOTE: Production environments mein threading.Thread ka istemal na karein. 
-        # Iski jagah Celery ya RQ jaisa Task Queue istemal karein.
-        update_thread = threading.Thread(
-            target=youtube_service.update_video_counts,
-            args=(channel_ids,)
-        )
-        update_thread.start()
+        job_id = job_queue.enqueue_job(db.get_request_connection(), 'update_video_counts', {
+            'channel_ids': channel_ids, 'full_refresh': bool(data.get('full_refresh', False))
+        })
 
-        return jsonify({'success': True, 'message': f'Update job started for {len(channel_ids)} channels.'})
+        return jsonify({'success': True, 'job_id': job_id, 'message': f'Update job #{job_id} queued for {len(channel_ids)} channels.'})
         
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
 
 
+@main_bp.route('/jobs/<int:job_id>/retry', methods=['POST'])
+def retry_job(job_id):
+    try:
+        updated = job_queue.retry_job(db.get_request_connection(), job_id)
+        if not updated:
+            return jsonify({'success': False, 'message': f'Job #{job_id} is not finished or does not exist.'}), 404
+        return jsonify({'success': True, 'message': f'Job #{job_id} queued again.'})
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+
+@main_bp.route('/jobs/<int:job_id>/resume', methods=['POST'])
+def resume_job(job_id):
+    try:
+        updated = job_queue.resume_job(db.get_request_connection(), job_id)
+        if not updated:
+            return jsonify({'success': False, 'message': f'Job #{job_id} is not paused or does not exist.'}), 404
+        return jsonify({'success': True, 'message': f'Job #{job_id} will resume from its checkpoint.'})
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+
+@main_bp.route('/jobs/<int:job_id>/status')
+def job_status(job_id):
+    """Loading page ise poll karta hai। Jawab kuch seconds ke liye process mein cache rehta hai।"""
+    try:
+        status = job_queue.cached_job_status(job_id)
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 503
+    if status is None:
+        return jsonify({'success': False, 'message': f'Job #{job_id} does not exist.'}), 404
+    return jsonify({'success': True, 'job': status, 'quota_message': get_quota_status_message()})
+
+
 @main_bp.route('/loading')
 def loading():
     quota_message = get_quota_status_message()
-    return render_template('loading.html', quota_message=quota_message)
+    return render_template('loading.html', quota_message=quota_message, job_id=request.args.get('job_id', type=int))
 
 @main_bp.route('/results')
 def results():
     quota_message = get_quota_status_message()
-    conn = youtube_service.get_db_connection()
+    conn = db.get_request_connection()
     cur = conn.cursor()
 
-    sort_by = request.args.get('sort_by', 'retrieved_at')
-    sort_order = request.args.get('sort_order', 'DESC')
     search_query = request.args.get('query', '').strip()
     filter_category = request.args.get('category_filter', '').strip()
-
-    # SUDHAR: instagram_link, twitter_link, linkedin_link ko select kiya gaya hai
-    sql_query = "SELECT channel_id, channel_name, subscriber_count, category, emails, phone_numbers, instagram_link, twitter_link, linkedin_link, status, short_videos_count, long_videos_count, retrieved_at FROM channels"
-    
-    where_clauses, params = [], {}
-    if search_query:
-        where_clauses.append("(channel_name ILIKE %(q)s OR emails ILIKE %(q)s)")
-        params['q'] = f'%{search_query}%'
-    if filter_category:
-        where_clauses.append("category = %(cat)s")
-        params['cat'] = filter_category
-
-    if where_clauses:
-        sql_query += " WHERE " + " AND ".join(where_clauses)
-    
-    allowed_sort = {'retrieved_at', 'subscriber_count', 'category', 'creation_date', 'short_videos_count', 'long_videos_count'}
-    if sort_by not in allowed_sort:
-        sort_by = 'retrieved_at'
-    if sort_order.upper() not in ['ASC', 'DESC']:
-        sort_order = 'DESC'
-        
+    after = request.args.get('after', '').strip()
     # SQL Injection risk ko kam karne ke liye sort by ko sanitize kiya gaya hai
-    sql_query += f" ORDER BY {sort_by} {sort_order}"
-    
-    cur.execute(sql_query, params)
-    channels = cur.fetchall()
+    sort_by, sort_order = channel_queries.normalize_sort(
+        request.args.get('sort_by'), request.args.get('sort_order', 'DESC'), search_query
+    )
+
+    # Poori table ki jagah sirf ek page (keyset pagination) laate hain
+    where_sql, params = channel_queries.build_filters(search_query, filter_category)
+    channels, next_cursor = channel_queries.fetch_results_page(cur, where_sql, params, sort_by, sort_order, after=after or None)
+    channel_count = None
+    if filter_category and not search_query:
+        # Sirf category filter: ginti summary table se (har job ke baad refresh hoti hai)
+        channel_count = channel_stats.category_count(cur, filter_category)
+        count_is_estimate = True
+    if channel_count is None:
+        channel_count, count_is_estimate = channel_queries.count_channels(cur, where_sql, params)
     cur.close()
-    conn.close()
+    conn.rollback()
     
-    all_categories = list(youtube_service.CATEGORY_KEYWORDS.keys())
+    all_categories = list(CATEGORY_KEYWORDS.keys())
     
     return render_template(
         'results.html', 
         channels=channels, 
-        channel_count=len(channels), 
+        channel_count=channel_count, 
+        count_is_estimate=count_is_estimate,
+        next_cursor=next_cursor,
+        is_first_page=not after,
         all_categories=all_categories, 
         current_sort_by=sort_by, 
         current_sort_order=sort_order, 
         current_search_query=search_query, 
         current_filter_category=filter_category, 
+        channel_statuses=channel_queries.CHANNEL_STATUSES,
         quota_message=quota_message
     )
 
@@ -142,51 +169,168 @@ def results():
 def update_status():
     try:
         data = request.get_json()
-        conn = youtube_service.get_db_connection()
+        conn = db.get_request_connection()
         cur = conn.cursor()
         cur.execute("UPDATE channels SET status = %s WHERE channel_id = %s", (data['status'], data['channel_id']))
         conn.commit()
         cur.close()
-        conn.close()
         return jsonify({'success': True})
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
 
 @main_bp.route('/delete', methods=['POST'])
 def delete():
-    conn = youtube_service.get_db_connection()
+    conn = db.get_request_connection()
     cur = conn.cursor()
     payload = request.get_json()
     delete_type = payload.get('type')
     
     if delete_type == 'all':
         cur.execute("TRUNCATE TABLE channels RESTART IDENTITY;")
+        cur.execute("TRUNCATE TABLE category_stats;")
         flash("All channels have been deleted.", "success")
     elif delete_type == 'single':
-        cur.execute("DELETE FROM channels WHERE channel_id = %s", (payload.get('channel_id'),))
+        cur.execute("DELETE FROM channels WHERE channel_id = %s RETURNING category", (payload.get('channel_id'),))
+        channel_stats.refresh_category_stats(cur, [row[0] for row in cur.fetchall()])
         
     conn.commit()
     cur.close()
-    conn.close()
     return jsonify({'success': True})
 
+def _bulk_target_from_payload(payload):
+    """
+    Bulk request mein `channel_ids` ki list, `filter` object, ya saare channels ke liye `"all": true`।
+    Galat ya khali target par InvalidBulkTarget।
+    """
+    channel_ids = payload.get('channel_ids')
+    if channel_ids:
+        if not isinstance(channel_ids, list):
+            raise channel_queries.InvalidBulkTarget('channel_ids must be a list.')
+        return channel_queries.bulk_target(channel_ids=channel_ids)
+    if payload.get('all') is True:
+        return channel_queries.bulk_target(match_all=True)
+    if isinstance(payload.get('filter'), dict):
+        return channel_queries.bulk_target(filters=payload['filter'])
+    raise channel_queries.InvalidBulkTarget('Send channel_ids, a filter, or "all": true.')
+
+
+@main_bp.route('/channels/bulk/status', methods=['POST'])
+def bulk_update_status():
+    """Kai channels ka status ek UPDATE aur ek transaction mein। {channel_ids: [...]}, {filter: {...}} ya {all: true}।"""
+    payload = request.get_json(silent=True) or {}
+    status = payload.get('status')
+    if status not in channel_queries.CHANNEL_STATUSES:
+        return jsonify({'success': False, 'message': f'Unknown status: {status}'}), 400
+    try:
+        target = _bulk_target_from_payload(payload)
+    except channel_queries.InvalidBulkTarget as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
+    conn = db.get_request_connection()
+    try:
+        with conn.cursor() as cur:
+            updated = channel_queries.bulk_update_status(cur, status, *target)
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        return jsonify({'success': False, 'message': str(e)}), 500
+    return jsonify({'success': True, 'updated': updated})
+
+
+@main_bp.route('/channels/bulk/delete', methods=['POST'])
+def bulk_delete():
+    payload = request.get_json(silent=True) or {}
+    try:
+        target = _bulk_target_from_payload(payload)
+    except channel_queries.InvalidBulkTarget as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
+    conn = db.get_request_connection()
+    try:
+        with conn.cursor() as cur:
+            deleted, categories = channel_queries.bulk_delete(cur, *target)
+            channel_stats.refresh_category_stats(cur, categories)
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        return jsonify({'success': False, 'message': str(e)}), 500
+    return jsonify({'success': True, 'deleted': deleted})
+
+
+@main_bp.route('/stats')
+def stats():
+    """
+    Category-wise aggregates (category_stats summary table se, channels table scan nahi hoti)।
+    ?category= se ek category, ?derived=1 se pandas wale derived ratios bhi।
+    """
+    category = request.args.get('category', '').strip() or None
+    conn = db.get_request_connection()
+    try:
+        with conn.cursor() as cur:
+            rows = channel_stats.load_category_stats(cur, category)
+        conn.rollback()
+    except Exception as e:
+        conn.rollback()
+        return jsonify({'success': False, 'message': str(e)}), 503
+
+    if request.args.get('derived', '').lower() in ('1', 'true', 'yes'):
+        try:
+            frame = channel_stats.stats_frame(rows)
+        except RuntimeError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
+        rows = json.loads(frame.reset_index().to_json(orient='records'))
+    return jsonify({'success': True, 'categories': rows, 'totals': channel_stats.summarize(rows)})
+
+
 @main_bp.route('/download')
 def download():
-    conn = youtube_service.get_db_connection()
-    df = pd.read_sql_query("SELECT channel_name, subscriber_count, category, emails, phone_numbers, instagram_link, twitter_link, linkedin_link, status, short_videos_count, long_videos_count, description, creation_date, retrieved_at FROM channels ORDER BY subscriber_count DESC", conn)
-    conn.close()
-    
-    output = io.BytesIO()
-    df.to_csv(output, index=False, encoding='utf-8')
-    output.seek(0)
-    
-    return send_file(output, mimetype='text/csv', as_attachment=True, download_name='youtubers_data.csv')
+    """
+    Channels ko stream karke export karta hai (format=csv|jsonl|parquet, gzip=1)।
+    /results wale filters (query, category_filter) yahan bhi lagte hain।
+    """
+    export_format = request.args.get('format', 'csv').lower()
+    use_gzip = request.args.get('gzip', '').lower() in ('1', 'true', 'yes') and export_format != 'parquet'
+    where_sql, params = channel_queries.build_filters(
+        request.args.get('query', '').strip(), request.args.get('category_filter', '').strip()
+    )
+
+    try:
+        chunks = export_service.stream_export(export_format, where_sql, params, gzip=use_gzip)
+    except export_service.ExportFormatUnavailable as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
+    mimetype, extension = export_service.EXPORT_FORMATS[export_format]
+    filename = f"youtubers_data.{extension}" + ('.gz' if use_gzip else '')
+    return Response(
+        stream_with_context(chunks),
+        mimetype='application/gzip' if use_gzip else mimetype,
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'},
+    )
+
+@main_bp.route('/health/db')
+def db_health():
+    """Connection pool ka size aur wait-time metrics JSON mein dikhata hai।"""
+    try:
+        conn = db.get_request_connection()
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1")
+        conn.rollback()
+        return jsonify({'success': True, 'pool': db.pool_stats()})
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e), 'pool': db.pool_stats()}), 503
+
+@main_bp.route('/metrics')
+def metrics_endpoint():
+    """Is web process ke metrics Prometheus text format mein (workers apne port par dete hain)।"""
+    return Response(metrics.render_prometheus(), content_type=metrics.PROMETHEUS_CONTENT_TYPE)
 
 # =========================================================
 # DATABASE SETUP ROUTE (USE ONLY ONCE, THEN REMOVE)
 # =========================================================
 @main_bp.route('/setup-database-for-the-first-time-9e7d3f')
 def setup_database():
+    # यह इम्पोर्ट केवल एक बार डेटाबेस सेटअप के लिए है, isliye har worker ke startup par nahi hota
+    from init_db import initialize_database
     try:
         initialize_database()
         flash("DATABASE SETUP SUCCESSFUL! Tables have been created.", "success")
@@ -0,0 +1,99 @@
+import hashlib
+import json
+import os
+import threading
+
+from app.services import db
+
+API_CACHE_ENABLED = os.getenv('API_CACHE_ENABLED', 'true').lower() == 'true'
+# search.list 100 units ka hai, isliye uske pages zyada der tak rakhte hain
+SEARCH_CACHE_TTL = float(os.getenv('SEARCH_CACHE_TTL_HOURS', 24 * 7)) * 3600
+CHANNELS_CACHE_TTL = float(os.getenv('CHANNELS_CACHE_TTL_HOURS', 24)) * 3600
+API_CACHE_MAX_BYTES = int(os.getenv('API_CACHE_MAX_MB', 512)) * 1024 * 1024
+# Har itne writes ke baad expired entries aur size cap check hota hai
+API_CACHE_EVICT_EVERY = int(os.getenv('API_CACHE_EVICT_EVERY', 100))
+
+_writes_since_evict = 0
+_evict_lock = threading.Lock()
+
+
+def make_key(resource, params):
+    """resource + params ka stable hash। API key is mein shamil nahi hai, isliye sabhi keys cache share karti hain।"""
+    raw = json.dumps({'resource': resource, 'params': params}, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def get(resource, params):
+    """Cache mein zinda (expire na hua) response ho to lautata hai, warna None।"""
+    if not API_CACHE_ENABLED:
+        return None
+    try:
+        with db.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "SELECT payload FROM api_cache WHERE cache_key = %s AND expires_at > CURRENT_TIMESTAMP",
+                    (make_key(resource, params),)
+                )
+                row = cur.fetchone()
+            conn.rollback()
+    except Exception as e:
+        print(f"LOG: API cache padh nahi paaye ({e})। Seedha API call karenge।")
+        return None
+    return row[0] if row else None
+
+
+def put(resource, params, payload, ttl_seconds):
+    if not API_CACHE_ENABLED or not ttl_seconds:
+        return
+    body = json.dumps(payload)
+    try:
+        with db.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    INSERT INTO api_cache (cache_key, resource, payload, size_bytes, created_at, expires_at)
+                    VALUES (%s, %s, %s::jsonb, %s, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP + make_interval(secs => %s))
+                    ON CONFLICT (cache_key) DO UPDATE
+                    SET payload = EXCLUDED.payload, size_bytes = EXCLUDED.size_bytes,
+                        created_at = EXCLUDED.created_at, expires_at = EXCLUDED.expires_at;
+                """, (make_key(resource, params), resource, body, len(body.encode('utf-8')), ttl_seconds))
+            conn.commit()
+    except Exception as e:
+        print(f"LOG: API response cache mein save nahi hua: {e}")
+        return
+    _maybe_evict()
+
+
+def _maybe_evict():
+    global _writes_since_evict
+    with _evict_lock:
+        _writes_since_evict += 1
+        if _writes_since_evict < API_CACHE_EVICT_EVERY:
+            return
+        _writes_since_evict = 0
+    try:
+        evict()
+    except Exception as e:
+        print(f"LOG: API cache eviction fail hua: {e}")
+
+
+def evict(max_bytes=API_CACHE_MAX_BYTES):
+    """Expired entries hatata hai, phir size cap se upar ho to sabse purani entries। Hatayi gayi rows lautata hai।"""
+    with db.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("DELETE FROM api_cache WHERE expires_at <= CURRENT_TIMESTAMP")
+            removed = cur.rowcount
+            cur.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM api_cache")
+            excess = cur.fetchone()[0] - max_bytes
+            if excess > 0:
+                cur.execute("""
+                    DELETE FROM api_cache WHERE cache_key IN (
+                        SELECT cache_key FROM (
+                            SELECT cache_key, SUM(size_bytes) OVER (ORDER BY created_at, cache_key) - size_bytes AS freed_before
+                            FROM api_cache
+                        ) oldest
+                        WHERE freed_before < %s
+                    );
+                """, (excess,))
+                removed += cur.rowcount
+        conn.commit()
+    return removed
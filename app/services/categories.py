@@ -0,0 +1,10 @@
+# SUDHAR: CATEGORY_KEYWORDS को और ज़्यादा हिंदी/Hinglish शब्दों के साथ विस्तृत और लक्षित (targeted) बनाया गया है
+CATEGORY_KEYWORDS = {
+    "Technology": "hindi tech, gadgets review, unboxing, mobile review, laptop review, tech news india, smartphone tips, android tricks, iphone tricks, programming hindi, python hindi, pc build india, latest gadgets, ai explained hindi, software development, cyber security awareness, tech tips and tricks, saste gadgets, tech channel",
+    "Gaming": "gaming india, live gameplay, mobile gaming, pc games, bgmi live, valorant india, free fire gameplay, gta v hindi, minecraft hindi, gaming shorts, gaming channel, best android games, gaming pc build, ps5 india, pro gamer, gaming highlights, game walkthrough hindi, op gameplay",
+    "Finance": "stock market india, personal finance, investing for beginners, mutual funds sahi hai, share market live, sip investment, cryptocurrency india, bitcoin hindi, how to save money, credit card tips, budgeting tips hindi, business ideas, startup india, case study hindi, make money online, nifty 50, intraday trading",
+    "Education": "educational channel, study iq, online learning india, upsc preparation, ssc cgl, neet motivation, jee mains, current affairs 2025, gk in hindi, skill development, english speaking course, communication skills, history in hindi, science experiments, amazing facts, knowledge video, class 12",
+    "Comedy": "hindi comedy, funny video, vines, stand up comedy, comedy sketch, funny roast, prank video india, desi comedy, animation comedy, mimicry, funny dubbing, bhojpuri comedy, haryanvi comedy, comedy shorts",
+    "Vlogging": "daily vlog, lifestyle vlog, travel vlogger india, india travel vlog, mountain vlog, goa vlog, budget travel, moto vlogging india, food vlog, shopping haul, village life vlog, family vlog, couple vlog, a day in my life, my first vlog",
+    "YouTube related": "1000 subscribers kaise kare, 4000 watch time kaise kare, youtube channel grow kaise kare, video viral kaise kare, views kaise laye, subscribers jaldi kaise badhaye, youtube par safal kaise ho, youtube seo tips hindi, youtube channel monetization, content creator tips, creator economy, youtube algorithm explained, youtube channel audit, tubebuddy tutorial, vidiq tutorial, thumbnail creation tutorial, video editing for creators, best editing app for youtube, youtube shorts monetization, copyright policy explained, adsense setup hindi, youtube se paise kaise kamaye, online kamai youtube, youtube se kitna paisa milta hai, youtube ka paisa, youtube ki first payment, youtube earning proof, youtube video par tags kaise lagaye, youtube channel setting, youtube channel customize kaise kare, ranking tags for youtube, canva tutorial for youtube thumbnail, zero se youtube channel kaise banaye, youtube par views kaise badhaye, video upload karne ka sahi tarika, youtube studio use karna, best mic for youtube hindi, best camera for youtube hindi, youtube channel ka naam kaise rakhe, youtube channel delete kaise kare, video edit kaise kare, live stream kaise kare, youtube short video viral kaise kare, youtube ka naya update, youtube monetization ke naye rules"
+}
@@ -0,0 +1,297 @@
+import base64
+import json
+import re
+import threading
+import time
+from datetime import datetime
+
+RESULTS_PAGE_SIZE = 100
+COUNT_CACHE_TTL = 60
+
+# Har sort column ka SQL expression। NULLs ko COALESCE karte hain taaki keyset comparison
+# (expr, channel_id) < (%s, %s) sahi chale, aur init_db mein bilkul yahi expression index hota hai।
+SORT_EXPRESSIONS = {
+    'retrieved_at': "COALESCE(retrieved_at, '-infinity'::timestamptz)",
+    'subscriber_count': "COALESCE(subscriber_count, -1)",
+    'category': "COALESCE(category, '')",
+    'creation_date': "COALESCE(creation_date, '-infinity'::date)",
+    'short_videos_count': "COALESCE(short_videos_count, -1)",
+    'long_videos_count': "COALESCE(long_videos_count, -1)",
+}
+DEFAULT_SORT = 'retrieved_at'
+# Cursor ki sort key ka format har sort expression ke type (Postgres ka ::text output) ke hisaab se;
+# mel na khaye to key ko SQL mein bhejne ki jagah pehla page dikhate hain
+_TIMESTAMP_KEY = re.compile(r'(\d{4}-\d{2}-\d{2}) (\d{2}:\d{2}:\d{2})(\.\d{1,6})?[+-]\d{2}(:\d{2}){0,2}')
+_REAL_KEY = re.compile(r'-?\d+(\.\d+)?([eE][+-]?\d+)?')
+
+
+def _integer_key(bits):
+    limit = 2 ** (bits - 1)
+
+    def check(key):
+        return bool(re.fullmatch(r'-?\d{1,19}', key)) and -limit <= int(key) < limit
+    return check
+
+
+def _date_key(key):
+    if key in ('infinity', '-infinity'):
+        return True
+    try:
+        datetime.strptime(key, '%Y-%m-%d')
+    except ValueError:
+        return False
+    return True
+
+
+def _timestamp_key(key):
+    match = _TIMESTAMP_KEY.fullmatch(key)
+    if match is None:
+        return key in ('infinity', '-infinity')
+    try:
+        datetime.strptime(f"{match.group(1)} {match.group(2)}", '%Y-%m-%d %H:%M:%S')
+    except ValueError:
+        return False
+    return True
+
+
+SORT_KEY_VALIDATORS = {
+    'retrieved_at': _timestamp_key,
+    'subscriber_count': _integer_key(64),
+    'category': lambda key: True,
+    'creation_date': _date_key,
+    'short_videos_count': _integer_key(32),
+    'long_videos_count': _integer_key(32),
+    # ts_rank ka type real hai (hadd ~3.4e38)
+    'relevance': lambda key: bool(_REAL_KEY.fullmatch(key)) and abs(float(key)) < 3.4e38,
+}
+# Search query ke saath 'relevance' sort bhi milta hai (full-text rank, sabse achha match pehle)
+RELEVANCE_SORT = 'relevance'
+RELEVANCE_EXPRESSION = "ts_rank(search_vector, websearch_to_tsquery('simple', %(q)s))"
+# Trigram index 3 characters se chhote patterns par kaam nahi karta
+MIN_TRIGRAM_QUERY_LENGTH = 3
+
+# /results ke status dropdown ki values
+CHANNEL_STATUSES = ('New', 'Contacted', 'Follow-up', 'Converted', 'Not a Fit')
+
+RESULT_COLUMNS = (
+    "channel_id, channel_name, subscriber_count, category, emails, phone_numbers, instagram_link, "
+    "twitter_link, linkedin_link, status, short_videos_count, long_videos_count, retrieved_at"
+)
+
+
+def search_index_statements():
+    """
+    init_db ke liye: name, emails aur description par full-text (tsvector) aur trigram GIN indexes।
+    search_vector ek generated column hai, isliye har INSERT/UPDATE par Postgres khud use bharta hai।
+    'simple' config istemal karte hain kyunki descriptions Hindi/Hinglish/English mix hoti hain।
+    """
+    return [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm;",
+        """
+        ALTER TABLE channels ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(channel_name, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(emails, '')), 'B') ||
+            setweight(to_tsvector('simple', coalesce(description, '')), 'C')
+        ) STORED;
+        """,
+        "CREATE INDEX IF NOT EXISTS channels_search_vector_idx ON channels USING GIN (search_vector);",
+        "CREATE INDEX IF NOT EXISTS channels_name_trgm_idx ON channels USING GIN (channel_name gin_trgm_ops);",
+        "CREATE INDEX IF NOT EXISTS channels_emails_trgm_idx ON channels USING GIN (emails gin_trgm_ops);",
+        "CREATE INDEX IF NOT EXISTS channels_description_trgm_idx ON channels USING GIN (description gin_trgm_ops);",
+    ]
+
+
+def sort_index_statements():
+    """init_db ke liye: har sort order ke liye (expr, channel_id) composite index।"""
+    statements = [
+        f"CREATE INDEX IF NOT EXISTS channels_sort_{column}_idx ON channels (({expression}), channel_id);"
+        for column, expression in SORT_EXPRESSIONS.items()
+    ]
+    # Category filter ke saath default sort
+    statements.append(
+        f"CREATE INDEX IF NOT EXISTS channels_category_sort_retrieved_at_idx "
+        f"ON channels (category, ({SORT_EXPRESSIONS['retrieved_at']}), channel_id);"
+    )
+    return statements
+
+
+def normalize_sort(sort_by, sort_order, search_query=''):
+    """Search query ho aur sort na diya gaya ho to results relevance ke hisaab se aate hain।"""
+    if search_query and sort_by in (None, '', RELEVANCE_SORT):
+        return RELEVANCE_SORT, 'DESC'
+    if sort_by not in SORT_EXPRESSIONS:
+        sort_by = DEFAULT_SORT
+    sort_order = (sort_order or '').upper()
+    if sort_order not in ('ASC', 'DESC'):
+        sort_order = 'DESC'
+    return sort_by, sort_order
+
+
+def build_filters(search_query='', filter_category=''):
+    """/results ke filters ka WHERE clause (bina 'WHERE' ke) aur params lautata hai।"""
+    where_clauses, params = [], {}
+    if search_query:
+        # Full-text match search_vector index se, aur substring match (3+ characters) trigram indexes se.
+        # Dono OR hote hain, Postgres inhe BitmapOr se jodta hai - sequential scan nahi hota।
+        search_clauses = ["search_vector @@ websearch_to_tsquery('simple', %(q)s)"]
+        params['q'] = search_query
+        if len(search_query) >= MIN_TRIGRAM_QUERY_LENGTH:
+            search_clauses.append("channel_name ILIKE %(q_like)s OR emails ILIKE %(q_like)s OR description ILIKE %(q_like)s")
+            params['q_like'] = f'%{_escape_like(search_query)}%'
+        where_clauses.append("(" + " OR ".join(search_clauses) + ")")
+    if filter_category:
+        where_clauses.append("category = %(cat)s")
+        params['cat'] = filter_category
+    return " AND ".join(where_clauses), params
+
+
+class InvalidBulkTarget(Exception):
+    """Bulk request ka target galat ho: anjaan filter keys, ya aisa filter jisse koi shart na bane।"""
+
+
+BULK_FILTER_KEYS = ('query', 'category_filter')
+
+
+def bulk_target(channel_ids=None, filters=None, match_all=False):
+    """
+    Bulk action kin channels par lage: IDs ki list (`channel_id = ANY(...)`, primary key se) ya
+    /results jaisa filter ({'query', 'category_filter'})। Saare channels sirf match_all=True par;
+    anjaan keys ya khali filter par InvalidBulkTarget, taaki galti se poori table na badle।
+    Lautata hai: (where_sql, params)।
+    """
+    if channel_ids:
+        return "channel_id = ANY(%(ids)s)", {'ids': [str(channel_id) for channel_id in channel_ids]}
+    if match_all:
+        return '', {}
+    filters = filters or {}
+    unknown = sorted(set(filters) - set(BULK_FILTER_KEYS))
+    if unknown:
+        raise InvalidBulkTarget(f"Unknown filter keys: {', '.join(unknown)}. Allowed: {', '.join(BULK_FILTER_KEYS)}.")
+    where_sql, params = build_filters(
+        str(filters.get('query') or '').strip(), str(filters.get('category_filter') or '').strip()
+    )
+    if not where_sql:
+        raise InvalidBulkTarget('The filter has no conditions. Send "all": true to change every channel.')
+    return where_sql, params
+
+
+def bulk_update_status(cur, status, where_sql, params):
+    """Ek hi UPDATE statement; badli gayi rows ki ginti lautata hai (commit caller karta hai)।"""
+    sql = "UPDATE channels SET status = %(status)s" + (f" WHERE {where_sql}" if where_sql else "")
+    cur.execute(sql, dict(params, status=status))
+    return cur.rowcount
+
+
+def bulk_delete(cur, where_sql, params):
+    """
+    Ek hi DELETE; lautata hai (hatayi gayi rows, jin categories se rows hatin) taaki caller
+    usi transaction mein category stats refresh kar sake।
+    """
+    cur.execute(f"""
+        WITH deleted AS (
+            DELETE FROM channels{f" WHERE {where_sql}" if where_sql else ""} RETURNING category
+        )
+        SELECT COALESCE(category, ''), COUNT(*) FROM deleted GROUP BY 1
+    """, params)
+    per_category = dict(cur.fetchall())
+    # Cache ki hui ginti ab purani ho gayi
+    with _count_cache_lock:
+        _count_cache.clear()
+    return sum(per_category.values()), list(per_category)
+
+
+def _escape_like(value):
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def sort_expression(sort_by):
+    return RELEVANCE_EXPRESSION if sort_by == RELEVANCE_SORT else SORT_EXPRESSIONS[sort_by]
+
+
+def encode_cursor(sort_by, sort_order, sort_key, channel_id):
+    raw = json.dumps([sort_by, sort_order, sort_key, channel_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+
+def decode_cursor(cursor, sort_by, sort_order):
+    """
+    Cursor se (sort key, channel_id)। Galat ya chhedchhad kiya hua cursor, doosre sort/order ka
+    cursor, ya sort expression ke type se mel na khane wali key None deti hai (yani pehla page)।
+    """
+    try:
+        cursor_sort_by, cursor_order, sort_key, channel_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except Exception:
+        return None
+    if cursor_sort_by != sort_by or cursor_order != sort_order or sort_by not in SORT_KEY_VALIDATORS:
+        return None
+    if not isinstance(sort_key, str) or not isinstance(channel_id, str) or not SORT_KEY_VALIDATORS[sort_by](sort_key):
+        return None
+    return sort_key, channel_id
+
+
+def fetch_results_page(cur, where_sql, params, sort_by, sort_order, after=None, page_size=RESULTS_PAGE_SIZE):
+    """
+    Keyset pagination: OFFSET ki jagah pichhle page ki aakhri row (sort key, channel_id) ke
+    baad se padhta hai, isliye har page index se seedha milta hai।
+    Lautata hai: (rows, next_cursor ya None)।
+    """
+    expression = sort_expression(sort_by)
+    comparison = '<' if sort_order == 'DESC' else '>'
+    clauses = [where_sql] if where_sql else []
+    params = dict(params)
+
+    cursor = decode_cursor(after, sort_by, sort_order) if after else None
+    if cursor:
+        # Sort key text ke roop mein aata hai; Postgres use expression ke type mein cast kar leta hai
+        clauses.append(f"(({expression}), channel_id) {comparison} (%(after_key)s, %(after_id)s)")
+        params['after_key'], params['after_id'] = cursor
+
+    sql = f"SELECT {RESULT_COLUMNS}, ({expression})::text AS sort_key FROM channels"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += f" ORDER BY ({expression}) {sort_order}, channel_id {sort_order} LIMIT %(page_size)s"
+    # Ek row zyada mangwate hain taaki pata chale ki agla page hai ya nahi
+    params['page_size'] = page_size + 1
+
+    cur.execute(sql, params)
+    rows = cur.fetchall()
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = encode_cursor(sort_by, sort_order, rows[-1][-1], rows[-1][0])
+    return [row[:-1] for row in rows], next_cursor
+
+
+_count_cache = {}
+_count_cache_lock = threading.Lock()
+
+
+def count_channels(cur, where_sql, params):
+    """
+    Total ginti। Bina filter ke pg_class ka estimate (turant) istemal hota hai, filter ke saath
+    COUNT(*) ka result COUNT_CACHE_TTL seconds tak cache rehta hai।
+    Lautata hai: (count, is_estimate)।
+    """
+    if not where_sql:
+        cur.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = 'channels'::regclass")
+        row = cur.fetchone()
+        # Table kabhi ANALYZE na hua ho to reltuples -1 (ya 0) hota hai
+        if row and row[0] and row[0] > 0:
+            return row[0], True
+
+    cache_key = (where_sql, tuple(sorted(params.items())))
+    now = time.monotonic()
+    with _count_cache_lock:
+        cached = _count_cache.get(cache_key)
+        if cached and cached[1] > now:
+            return cached[0], False
+
+    sql = "SELECT COUNT(*) FROM channels" + (f" WHERE {where_sql}" if where_sql else "")
+    cur.execute(sql, params)
+    count = cur.fetchone()[0]
+    with _count_cache_lock:
+        # Purani entries hata dein taaki cache bina hadd ke na badhe
+        for key in [key for key, (_, expires) in _count_cache.items() if expires <= now]:
+            del _count_cache[key]
+        _count_cache[cache_key] = (count, now + COUNT_CACHE_TTL)
+    return count, False
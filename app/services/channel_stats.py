@@ -0,0 +1,194 @@
+import logging
+
+from app.services import metrics
+
+# Subscriber buckets: (column, lower bound, upper bound) - upper None matlab koi hadd nahi
+SUBSCRIBER_BUCKETS = (
+    ('subs_under_1k', None, 1000),
+    ('subs_1k_10k', 1000, 10000),
+    ('subs_10k_100k', 10000, 100000),
+    ('subs_100k_1m', 100000, 1000000),
+    ('subs_1m_plus', 1000000, None),
+)
+STATS_COLUMNS = (
+    'category', 'channels', 'contactable', 'with_email', 'with_phone', 'total_subscribers',
+    'avg_subscribers', 'median_subscribers', 'p90_subscribers',
+) + tuple(column for column, _, _ in SUBSCRIBER_BUCKETS) + (
+    'counted_channels', 'short_videos', 'long_videos', 'refreshed_at',
+)
+
+STATS_REFRESH_SECONDS = metrics.histogram('category_stats_refresh_seconds', 'Time to refresh category_stats rows')
+
+
+def category_stats_statements():
+    """init_db ke liye summary table ka DDL।"""
+    bucket_columns = ''.join(f"\n            {column} BIGINT NOT NULL DEFAULT 0," for column, _, _ in SUBSCRIBER_BUCKETS)
+    return [f"""
+        CREATE TABLE IF NOT EXISTS category_stats (
+            category VARCHAR(100) PRIMARY KEY,
+            channels BIGINT NOT NULL DEFAULT 0,
+            contactable BIGINT NOT NULL DEFAULT 0,
+            with_email BIGINT NOT NULL DEFAULT 0,
+            with_phone BIGINT NOT NULL DEFAULT 0,
+            total_subscribers NUMERIC NOT NULL DEFAULT 0,
+            avg_subscribers DOUBLE PRECISION,
+            median_subscribers DOUBLE PRECISION,
+            p90_subscribers DOUBLE PRECISION,{bucket_columns}
+            counted_channels BIGINT NOT NULL DEFAULT 0,
+            short_videos BIGINT NOT NULL DEFAULT 0,
+            long_videos BIGINT NOT NULL DEFAULT 0,
+            refreshed_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+        );
+    """]
+
+
+def _bucket_expression(lower, upper):
+    conditions = []
+    if lower is not None:
+        conditions.append(f"subscriber_count >= {lower}")
+    if upper is not None:
+        conditions.append(f"subscriber_count < {upper}")
+    return f"COUNT(*) FILTER (WHERE {' AND '.join(conditions)})"
+
+
+def _aggregate_sql(where_sql):
+    buckets = ''.join(
+        f",\n            {_bucket_expression(lower, upper)}" for _, lower, upper in SUBSCRIBER_BUCKETS
+    )
+    return f"""
+        SELECT COALESCE(category, ''), COUNT(*),
+            COUNT(*) FILTER (WHERE COALESCE(emails, '') <> '' OR COALESCE(phone_numbers, '') <> ''),
+            COUNT(*) FILTER (WHERE COALESCE(emails, '') <> ''),
+            COUNT(*) FILTER (WHERE COALESCE(phone_numbers, '') <> ''),
+            COALESCE(SUM(subscriber_count), 0),
+            AVG(subscriber_count),
+            percentile_cont(0.5) WITHIN GROUP (ORDER BY subscriber_count),
+            percentile_cont(0.9) WITHIN GROUP (ORDER BY subscriber_count){buckets},
+            COUNT(*) FILTER (WHERE short_videos_count IS NOT NULL OR long_videos_count IS NOT NULL),
+            COALESCE(SUM(short_videos_count), 0),
+            COALESCE(SUM(long_videos_count), 0),
+            CURRENT_TIMESTAMP
+        FROM channels
+        {where_sql}
+        GROUP BY COALESCE(category, '')
+    """
+
+
+def refresh_category_stats(cur, categories=None):
+    """
+    Sirf diye gaye categories ke aggregates dobara ginta hai (category index se, poori table nahi);
+    categories=None par saari table se summary dobara banti hai। Jin categories mein ab koi
+    channel nahi bacha unki row hata di jaati hai। Commit caller karta hai।
+    """
+    if categories is not None:
+        categories = sorted({category or '' for category in categories})
+        if not categories:
+            return 0
+        # COALESCE ki jagah OR, taaki category wala index istemal ho
+        where_sql = "WHERE category = ANY(%(categories)s) OR (category IS NULL AND '' = ANY(%(categories)s))"
+        params = {'categories': categories}
+    else:
+        where_sql, params = '', {}
+
+    column_list = ', '.join(STATS_COLUMNS)
+    updates = ', '.join(f"{column} = EXCLUDED.{column}" for column in STATS_COLUMNS[1:])
+    with STATS_REFRESH_SECONDS.time():
+        cur.execute(f"""
+            INSERT INTO category_stats ({column_list})
+            {_aggregate_sql(where_sql)}
+            ON CONFLICT (category) DO UPDATE SET {updates};
+        """, params)
+        refreshed = cur.rowcount
+        if categories is None:
+            cur.execute("DELETE FROM category_stats WHERE category NOT IN (SELECT DISTINCT COALESCE(category, '') FROM channels)")
+        else:
+            cur.execute("""
+                DELETE FROM category_stats s WHERE s.category = ANY(%(categories)s)
+                AND NOT EXISTS (
+                    SELECT 1 FROM channels c
+                    WHERE c.category = s.category OR (c.category IS NULL AND s.category = '')
+                );
+            """, params)
+    return refreshed
+
+
+def refresh_after_job(conn, categories=None, channel_ids=None):
+    """
+    Job ke baad touched categories ki summary refresh karta hai। channel_ids diye hon to unki
+    categories DB se nikaali jaati hain। Stats fail hone se job fail nahi hona chahiye, isliye
+    error sirf log hota hai।
+    """
+    try:
+        with conn.cursor() as cur:
+            if channel_ids:
+                cur.execute(
+                    "SELECT DISTINCT COALESCE(category, '') FROM channels WHERE channel_id = ANY(%s)",
+                    (list(channel_ids),)
+                )
+                categories = set(categories or ()) | {row[0] for row in cur.fetchall()}
+            if not categories:
+                return
+            refresh_category_stats(cur, categories)
+        conn.commit()
+        metrics.log_event('category_stats_refreshed', categories=sorted(categories))
+    except Exception as e:
+        conn.rollback()
+        print(f"LOG: Category stats refresh nahi ho saka: {e}")
+        metrics.log_event('category_stats_refresh_failed', logging.WARNING, error=str(e))
+
+
+def load_category_stats(cur, category=None):
+    """Summary table se rows (dicts ki list); channels table ko chhua bhi nahi jata।"""
+    sql = f"SELECT {', '.join(STATS_COLUMNS)} FROM category_stats"
+    params = ()
+    if category is not None:
+        sql += " WHERE category = %s"
+        params = (category,)
+    cur.execute(sql + " ORDER BY channels DESC, category", params)
+    rows = []
+    for row in cur.fetchall():
+        item = dict(zip(STATS_COLUMNS, row))
+        item['total_subscribers'] = int(item['total_subscribers'])
+        item['refreshed_at'] = item['refreshed_at'].isoformat() if item['refreshed_at'] else None
+        rows.append(item)
+    return rows
+
+
+def summarize(rows):
+    """Category rows se poore dataset ka total (medians/percentiles category-wise hi milte hain)।"""
+    summable = [
+        column for column in STATS_COLUMNS
+        if column not in ('category', 'avg_subscribers', 'median_subscribers', 'p90_subscribers', 'refreshed_at')
+    ]
+    totals = {column: sum(row[column] for row in rows) for column in summable}
+    totals['avg_subscribers'] = totals['total_subscribers'] / totals['channels'] if totals['channels'] else None
+    totals['categories'] = len(rows)
+    return totals
+
+
+def category_count(cur, category):
+    """/results ke category filter ki ginti summary table se; row na ho to None।"""
+    cur.execute("SELECT channels FROM category_stats WHERE category = %s", (category,))
+    row = cur.fetchone()
+    return row[0] if row else None
+
+
+def stats_frame(rows):
+    """
+    Reports / notebooks ke liye: rows ka pandas DataFrame, derived columns (contact rate,
+    shorts share, bucket share) vectorised tarike se jode gaye। pandas optional hai।
+    """
+    try:
+        import numpy as np
+        import pandas as pd
+    except ImportError as e:
+        raise RuntimeError("Stats DataFrame ke liye 'pandas' install karein.") from e
+
+    frame = pd.DataFrame.from_records(rows, columns=list(STATS_COLUMNS)).set_index('category')
+    channels = frame['channels'].replace(0, np.nan)
+    frame['contact_rate'] = frame['contactable'] / channels
+    videos = (frame['short_videos'] + frame['long_videos']).replace(0, np.nan)
+    frame['shorts_share'] = frame['short_videos'] / videos
+    for column, _, _ in SUBSCRIBER_BUCKETS:
+        frame[f'{column}_share'] = frame[column] / channels
+    return frame
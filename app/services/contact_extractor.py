@@ -0,0 +1,108 @@
+import hashlib
+import re
+
+# Saare patterns module load par ek hi baar compile hote hain aur lowercase text par chalte hain।
+# re.IGNORECASE ke saath literal prefix ("instagram.com/") wala fast search band ho jata hai,
+# isliye description ko ek baar lower() karke case-sensitive patterns istemal karte hain।
+# Ek badi alternation (email|phone|...) har position par har branch try karti hai aur
+# purane 5 alag scans se bhi dheemi nikli, isliye har pattern ek literal/anchor se shuru hota hai
+# aur sirf tab chalta hai jab woh anchor description mein ho।
+_EMAIL_LOCAL_CHARS = frozenset('abcdefghijklmnopqrstuvwxyz0123456789._%+-')
+_EMAIL_DOMAIN = re.compile(r'[a-z0-9.-]+\.[a-z]{2,}')
+_HANDLE = re.compile(r'[a-z0-9_]+')
+_INSTAGRAM = re.compile(r'(?:instagram\.com/|ig:)([a-z0-9._]+)')
+_TWITTER_URL = re.compile(r'(?<![a-z0-9-])(?:twitter\.com|x\.com)/([a-z0-9_]+)')
+_LINKEDIN = re.compile(r'linkedin\.com/in/([a-z0-9-]+)')
+# Phone do step mein: pehle digits ka ek run dhoondo (sasta), phir us run ke andar asli number
+_PHONE_RUN = re.compile(r'[+\d][\d -]{8,}\d')
+_PHONE = re.compile(r'(?<![\d+])(?:\+?91[ -]?)?(?:[6-9]\d{2}[ -]?\d{3}[ -]?\d{4}|\d{10})(?!\d)')
+_NON_DIGITS = re.compile(r'\D')
+
+
+def normalize_phone(raw_phone):
+    """'+91 98765-43210' jaise number ko 10 digit '9876543210' format mein badalta hai।"""
+    digits = _NON_DIGITS.sub('', raw_phone)
+    if len(digits) == 12 and digits.startswith('91'):
+        digits = digits[2:]
+    return digits
+
+
+def _scan_at_signs(text):
+    """
+    Har '@' par ek hi baar ruk kar decide karta hai: email hai ya Twitter handle।
+    '@' se pehle email ke characters hon to woh email ka hissa hai, handle nahi।
+    Lautata hai: (emails ki list, pehle handle ki position aur value)।
+    """
+    emails = []
+    handle = None
+    at = text.find('@')
+    while at != -1:
+        start = at
+        while start > 0 and text[start - 1] in _EMAIL_LOCAL_CHARS:
+            start -= 1
+        if start < at:
+            domain = _EMAIL_DOMAIN.match(text, at + 1)
+            if domain:
+                emails.append(text[start:domain.end()])
+                at = text.find('@', domain.end())
+                continue
+        elif handle is None:
+            match = _HANDLE.match(text, at + 1)
+            if match:
+                handle = (at, match.group())
+        at = text.find('@', at + 1)
+    return emails, handle
+
+
+def extract_details(description):
+    """Description se email, phone aur social media links nikalta hai।"""
+    text = (description or '').lower()
+
+    emails, twitter = [], None
+    if '@' in text:
+        emails, twitter = _scan_at_signs(text)
+    if 'twitter.com/' in text or 'x.com/' in text:
+        match = _TWITTER_URL.search(text)
+        # Jo pehle aaye (URL ya @handle), wahi Twitter link banta hai
+        if match and (twitter is None or match.start() < twitter[0]):
+            twitter = (match.start(), match.group(1))
+
+    instagram = _INSTAGRAM.search(text) if ('instagram.com/' in text or 'ig:' in text) else None
+    linkedin = _LINKEDIN.search(text) if 'linkedin.com/in/' in text else None
+
+    # dict.fromkeys: duplicate hatata hai aur pehli baar ka order rakhta hai
+    phones = dict.fromkeys(
+        normalize_phone(phone)
+        for run in _PHONE_RUN.findall(text)
+        for phone in _PHONE.findall(run)
+    )
+
+    return {
+        "emails": ", ".join(dict.fromkeys(emails)),
+        "phones": ", ".join(phones),
+        "instagram_link": f"https://www.instagram.com/{instagram.group(1)}" if instagram else None,
+        "twitter_link": f"https://twitter.com/{twitter[1]}" if twitter else None,
+        "linkedin_link": f"https://www.linkedin.com/in/{linkedin.group(1)}" if linkedin else None,
+    }
+
+
+def description_hash(description):
+    """Description badli ya nahi, yeh jaanne ke liye uska md5 (security ke liye nahi)।"""
+    return hashlib.md5((description or '').encode('utf-8')).hexdigest()
+
+
+def extract_details_bulk(descriptions):
+    """
+    Kai descriptions (jaise channels().list ka 50-item page ya poore table ka backfill) ke liye
+    extract_details. Ek jaisi descriptions sirf ek baar scan hoti hain।
+    """
+    cache = {}
+    results = []
+    for description in descriptions:
+        description = description or ''
+        details = cache.get(description)
+        if details is None:
+            details = cache[description] = extract_details(description)
+        # Har channel ko apni copy milti hai, taaki caller badle to doosre par asar na ho
+        results.append(dict(details))
+    return results
@@ -0,0 +1,187 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import psycopg2
+from psycopg2 import pool as pg_pool
+
+from app.services import metrics
+
+
+class PoolTimeoutError(Exception):
+    """Jab tay samay mein pool se koi connection free na ho."""
+
+
+class ConnectionPoolManager:
+    """
+    psycopg2 ThreadedConnectionPool ke upar ek wrapper.
+    Connection ke liye wait karta hai (error nahi deta), checkout par health check karta hai
+    aur pool size / wait-time ke metrics rakhta hai.
+    """
+    def __init__(self, dsn, minconn=1, maxconn=10, checkout_timeout=30.0, health_check_interval=30.0):
+        self.dsn = dsn
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.checkout_timeout = checkout_timeout
+        self.health_check_interval = health_check_interval
+        self._pool = pg_pool.ThreadedConnectionPool(minconn, maxconn, dsn)
+        # ThreadedConnectionPool khali hone par PoolError deta hai, isliye semaphore se wait karte hain
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._lock = threading.Lock()
+        self._last_used = {}
+        self._stats = {
+            "checkouts_total": 0,
+            "checkout_timeouts_total": 0,
+            "health_check_failures_total": 0,
+            "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0,
+            "in_use": 0,
+        }
+
+    def getconn(self, timeout=None):
+        timeout = self.checkout_timeout if timeout is None else timeout
+        started = time.monotonic()
+        if not self._slots.acquire(timeout=timeout):
+            with self._lock:
+                self._stats["checkout_timeouts_total"] += 1
+            raise PoolTimeoutError(f"{timeout}s mein database connection nahi mila (pool max={self.maxconn}).")
+        try:
+            conn = self._checkout_healthy()
+        except Exception:
+            self._slots.release()
+            raise
+
+        waited = time.monotonic() - started
+        with self._lock:
+            self._stats["checkouts_total"] += 1
+            self._stats["in_use"] += 1
+            self._stats["wait_seconds_total"] += waited
+            self._stats["wait_seconds_max"] = max(self._stats["wait_seconds_max"], waited)
+        return conn
+
+    def _checkout_healthy(self):
+        conn = self._pool.getconn()
+        if conn.closed or not self._is_healthy(conn):
+            with self._lock:
+                self._stats["health_check_failures_total"] += 1
+            self._pool.putconn(conn, close=True)
+            conn = self._pool.getconn()
+        return conn
+
+    def _is_healthy(self, conn):
+        # Sirf der tak idle pade connections ko ping karte hain, har checkout par nahi
+        last_used = self._last_used.get(id(conn))
+        if last_used is not None and time.monotonic() - last_used < self.health_check_interval:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def putconn(self, conn, close=False):
+        try:
+            if not close and not conn.closed:
+                self._last_used[id(conn)] = time.monotonic()
+            else:
+                self._last_used.pop(id(conn), None)
+            # putconn khud hi adhure transaction ko rollback kar deta hai
+            self._pool.putconn(conn, close=close or bool(conn.closed))
+        finally:
+            with self._lock:
+                self._stats["in_use"] -= 1
+            self._slots.release()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats["pool_min"] = self.minconn
+        stats["pool_max"] = self.maxconn
+        stats["idle"] = len(self._pool._pool)
+        stats["open"] = len(self._pool._pool) + len(self._pool._used)
+        return stats
+
+    def closeall(self):
+        self._pool.closeall()
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+# Worker threads ki ginti se nikla minimum pool size; DB_POOL_MAX isse chhota ho to yahi chalta hai
+_min_pool_size = 0
+
+
+def require_connections(count):
+    """
+    Is process ka pool kam se kam `count` connections ka bane, chahe DB_POOL_MAX chhota ho।
+    Pool banne se pehle bulana chahiye (worker process shuru hote hi); bana hua pool badla nahi jata।
+    """
+    global _min_pool_size
+    _min_pool_size = max(_min_pool_size, count)
+    if _pool is not None and _pool_pid == os.getpid() and _pool.maxconn < count:
+        print(f"LOG: Pool pehle hi max={_pool.maxconn} ke saath ban chuka hai, {count} connections nahi mil payenge।")
+
+
+def get_pool():
+    """
+    Process-wide pool lautata hai. Pool pehli zaroorat par banta hai aur fork ke baad
+    (gunicorn workers / job worker processes) har process mein naya banta hai.
+    """
+    global _pool, _pool_pid
+    if _pool is not None and _pool_pid == os.getpid():
+        return _pool
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ConnectionPoolManager(
+                os.getenv('DATABASE_URL'),
+                minconn=int(os.getenv('DB_POOL_MIN', 1)),
+                maxconn=max(int(os.getenv('DB_POOL_MAX', 10)), _min_pool_size),
+                checkout_timeout=float(os.getenv('DB_POOL_TIMEOUT', 30)),
+                health_check_interval=float(os.getenv('DB_POOL_HEALTH_CHECK_INTERVAL', 30)),
+            )
+            _pool_pid = os.getpid()
+    return _pool
+
+
+@contextmanager
+def connection():
+    """Background jobs ke liye: pool se connection lo aur kaam ke baad wapas karo."""
+    db_pool = get_pool()
+    conn = db_pool.getconn()
+    try:
+        yield conn
+    finally:
+        db_pool.putconn(conn)
+
+
+def pool_stats():
+    if _pool is None or _pool_pid != os.getpid():
+        return {}
+    return _pool.stats()
+
+
+metrics.gauge_callback('db_pool', 'Connection pool stats (is process ka pool)', 'stat', pool_stats)
+
+
+# --- Flask integration: har request ke liye ek connection, request khatam hone par wapas ---
+
+def get_request_connection():
+    from flask import g
+    if 'db_conn' not in g:
+        g.db_conn = get_pool().getconn()
+    return g.db_conn
+
+
+def release_request_connection(exception=None):
+    from flask import g
+    conn = g.pop('db_conn', None)
+    if conn is not None:
+        get_pool().putconn(conn)
+
+
+def init_app(app):
+    app.teardown_appcontext(release_request_connection)
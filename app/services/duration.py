@@ -0,0 +1,82 @@
+import os
+from functools import lru_cache
+
+# YouTube Shorts ab 3 minute tak ke ho sakte hain
+SHORTS_MAX_SECONDS = int(os.getenv('SHORTS_MAX_SECONDS', 180))
+
+# Date part (T se pehle) aur time part (T ke baad) mein 'M' ka matlab alag hai: month vs minute
+_DATE_UNITS = {'Y': 365 * 86400, 'M': 30 * 86400, 'W': 7 * 86400, 'D': 86400}
+_TIME_UNITS = {'H': 3600, 'M': 60, 'S': 1}
+
+
+@lru_cache(maxsize=8192)
+def parse_duration(value):
+    """
+    contentDetails.duration (ISO-8601, jaise 'PT1H2M3S', 'P1DT2H', 'PT45.5S') ko seconds mein badalta hai।
+    String ko ek baar left-to-right scan karta hai, koi slice ya regex nahi banta।
+    Galat format par ValueError deta hai। Ek hi duration bahut baar aata hai, isliye result cache hota hai।
+    """
+    if not value or value[0] != 'P':
+        raise ValueError(f"ISO-8601 duration nahi hai: {value!r}")
+
+    units = _DATE_UNITS
+    total = 0.0
+    number = 0
+    fraction = 0.0
+    scale = 0.0  # 0 matlab abhi decimal point nahi aaya
+    has_digits = False
+    has_component = False
+    for i in range(1, len(value)):
+        ch = value[i]
+        if '0' <= ch <= '9':
+            if scale:
+                fraction += (ord(ch) - 48) * scale
+                scale /= 10
+            else:
+                number = number * 10 + (ord(ch) - 48)
+            has_digits = True
+        elif ch == '.' or ch == ',':
+            if scale or not has_digits:
+                raise ValueError(f"ISO-8601 duration nahi hai: {value!r}")
+            scale = 0.1
+        elif ch == 'T':
+            if units is _TIME_UNITS or has_digits:
+                raise ValueError(f"ISO-8601 duration nahi hai: {value!r}")
+            units = _TIME_UNITS
+        else:
+            multiplier = units.get(ch)
+            if multiplier is None or not has_digits:
+                raise ValueError(f"ISO-8601 duration nahi hai: {value!r}")
+            total += (number + fraction) * multiplier
+            number, fraction, scale, has_digits = 0, 0.0, 0.0, False
+            has_component = True
+
+    if has_digits or not has_component:
+        raise ValueError(f"ISO-8601 duration nahi hai: {value!r}")
+    return int(total) if total == int(total) else total
+
+
+def is_short(seconds, threshold=None):
+    """
+    Shorts: 0 se zyada aur threshold (default SHORTS_MAX_SECONDS) tak ke videos।
+    0 seconds (P0D) live/upcoming streams ke liye aata hai, woh Shorts nahi hain।
+    """
+    threshold = SHORTS_MAX_SECONDS if threshold is None else threshold
+    return 0 < seconds <= threshold
+
+
+def count_shorts(durations, threshold=None):
+    """
+    Ek poore videos().list batch ki durations se (shorts, long) ginti lautata hai।
+    Jo duration parse na ho, use long video gina jata hai taaki total sahi rahe।
+    """
+    threshold = SHORTS_MAX_SECONDS if threshold is None else threshold
+    shorts = 0
+    for duration in durations:
+        try:
+            seconds = parse_duration(duration)
+        except (ValueError, TypeError):
+            continue
+        if is_short(seconds, threshold):
+            shorts += 1
+    return shorts, len(durations) - shorts
@@ -0,0 +1,163 @@
+import csv
+import io
+import json
+import zlib
+
+from app.services import db
+from app.services.channel_queries import SORT_EXPRESSIONS
+
+EXPORT_COLUMNS = [
+    'channel_name', 'subscriber_count', 'category', 'emails', 'phone_numbers', 'instagram_link',
+    'twitter_link', 'linkedin_link', 'status', 'short_videos_count', 'long_videos_count',
+    'description', 'creation_date', 'retrieved_at',
+]
+EXPORT_FORMATS = {
+    # format: (mimetype, file extension)
+    'csv': ('text/csv', 'csv'),
+    'jsonl': ('application/x-ndjson', 'jsonl'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+}
+# Server-side cursor ek baar mein itni rows laata hai, aur itne bytes jama hone par chunk bheja jata hai
+EXPORT_FETCH_SIZE = 2000
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+
+class ExportFormatUnavailable(Exception):
+    """Jab maanga gaya format (jaise parquet) is server par available na ho."""
+
+
+def iter_channel_rows(where_sql='', params=None, fetch_size=EXPORT_FETCH_SIZE):
+    """
+    channels table ki rows named (server-side) cursor se thodi-thodi laata hai, taaki poori
+    table kabhi memory mein na aaye। Connection pool se liya jata hai aur stream khatam hone par lautta hai।
+    """
+    sql = f"SELECT {', '.join(EXPORT_COLUMNS)} FROM channels"
+    if where_sql:
+        sql += f" WHERE {where_sql}"
+    # /results ke (sort expression, channel_id) index ke hisaab se order, taaki pehli row bina poori table sort kiye aaye
+    sql += f" ORDER BY {SORT_EXPRESSIONS['subscriber_count']} DESC, channel_id DESC"
+
+    with db.connection() as conn:
+        try:
+            with conn.cursor(name='channels_export') as cur:
+                cur.itersize = fetch_size
+                cur.execute(sql, params or {})
+                for row in cur:
+                    yield row
+        finally:
+            conn.rollback()
+
+
+def stream_csv(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= EXPORT_CHUNK_BYTES:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode('utf-8')
+
+
+def stream_jsonl(rows):
+    chunk = []
+    size = 0
+    for row in rows:
+        line = json.dumps(dict(zip(EXPORT_COLUMNS, row)), default=str, ensure_ascii=False) + '\n'
+        chunk.append(line)
+        size += len(line)
+        if size >= EXPORT_CHUNK_BYTES:
+            yield ''.join(chunk).encode('utf-8')
+            chunk, size = [], 0
+    yield ''.join(chunk).encode('utf-8')
+
+
+class _ChunkSink(io.RawIOBase):
+    """Parquet writer jo bytes likhta hai, unhe generator ke liye jama karta hai।"""
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def stream_parquet(rows, row_group_size=EXPORT_FETCH_SIZE * 5):
+    """Har row group likhte hi uske bytes bhej deta hai। pyarrow optional dependency hai।"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ExportFormatUnavailable("Parquet export ke liye 'pyarrow' install karein.")
+
+    schema = pa.schema([
+        ('channel_name', pa.string()), ('subscriber_count', pa.int64()), ('category', pa.string()),
+        ('emails', pa.string()), ('phone_numbers', pa.string()), ('instagram_link', pa.string()),
+        ('twitter_link', pa.string()), ('linkedin_link', pa.string()), ('status', pa.string()),
+        ('short_videos_count', pa.int64()), ('long_videos_count', pa.int64()), ('description', pa.string()),
+        ('creation_date', pa.date32()), ('retrieved_at', pa.timestamp('us', tz='UTC')),
+    ])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression='snappy')
+    batch = []
+
+    def _write_batch():
+        columns = list(zip(*batch))
+        writer.write_table(pa.Table.from_arrays(
+            [pa.array(column, type=field.type) for column, field in zip(columns, schema)], schema=schema
+        ))
+        batch.clear()
+
+    try:
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= row_group_size:
+                _write_batch()
+                yield sink.drain()
+        if batch:
+            _write_batch()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def gzip_stream(chunks, level=6):
+    """Chunks ko on-the-fly gzip karta hai (poora file memory mein banaye bina)।"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def stream_export(export_format, where_sql='', params=None, gzip=False):
+    """Diye gaye format mein export ke byte chunks ka generator lautata hai।"""
+    if export_format not in EXPORT_FORMATS:
+        raise ExportFormatUnavailable(f"Anjaan export format: {export_format}")
+    if export_format == 'parquet':
+        # Parquet pehle se compressed hota hai, us par gzip nahi lagate
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ExportFormatUnavailable("Parquet export ke liye 'pyarrow' install karein.")
+        return stream_parquet(iter_channel_rows(where_sql, params))
+
+    rows = iter_channel_rows(where_sql, params)
+    chunks = stream_csv(rows) if export_format == 'csv' else stream_jsonl(rows)
+    return gzip_stream(chunks) if gzip else chunks
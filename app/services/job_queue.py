@@ -0,0 +1,421 @@
+import inspect
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+import traceback
+
+from app.services import db, metrics
+
+JOB_WORKER_CONCURRENCY = int(os.getenv('JOB_WORKER_CONCURRENCY', 2))
+JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', 3))
+JOB_POLL_INTERVAL = float(os.getenv('JOB_POLL_INTERVAL', 2))
+JOB_HEARTBEAT_INTERVAL = float(os.getenv('JOB_HEARTBEAT_INTERVAL', 30))
+# Itne der tak heartbeat na aaye to job ko mara hua maan kar dobara queue mein daal dete hain
+JOB_STALE_AFTER = float(os.getenv('JOB_STALE_AFTER_SECONDS', 300))
+JOB_RETRY_BACKOFF = float(os.getenv('JOB_RETRY_BACKOFF_SECONDS', 60))
+# Diya ho to har worker process `WORKER_METRICS_PORT + index` par /metrics serve karta hai
+WORKER_METRICS_PORT = int(os.getenv('WORKER_METRICS_PORT', 0))
+# /jobs/<id>/status ka result itne seconds tak process mein cache rehta hai
+JOB_STATUS_CACHE_TTL = float(os.getenv('JOB_STATUS_CACHE_TTL', 2))
+# Har itne ghante mein ek 'refresh_metadata' job apne-aap queue hota hai (0 = band)
+METADATA_REFRESH_INTERVAL_HOURS = float(os.getenv('METADATA_REFRESH_INTERVAL_HOURS', 6))
+# job_type -> interval (seconds); workers har PERIODIC_CHECK_INTERVAL seconds par dekhte hain ki koi due hai ya nahi
+PERIODIC_JOBS = {'refresh_metadata': METADATA_REFRESH_INTERVAL_HOURS * 3600}
+PERIODIC_CHECK_INTERVAL = 60
+
+JOBS_FINISHED = metrics.counter('jobs_total', 'Jobs finished by this worker, by outcome', ('job_type', 'outcome'))
+JOB_DURATION_SECONDS = metrics.histogram('job_duration_seconds', 'Job run time', ('job_type',),
+                                         buckets=metrics.JOB_DURATION_BUCKETS)
+
+
+class JobPaused(Exception):
+    """
+    Handler ise tab raise karta hai jab kaam beech mein rokna ho (jaise saari keys ka quota khatam)।
+    Checkpoint save rehta hai; `resume_after` diya ho to job us waqt apne-aap dobara chalega,
+    warna 'paused' rehta hai jab tak /jobs/<id>/resume na ho।
+    """
+    def __init__(self, message, resume_after=None):
+        super().__init__(message)
+        self.resume_after = resume_after
+
+
+def _get_handlers():
+    # youtube_service ko yahan import karte hain taaki circular import na ho
+    from app.services import youtube_service
+    return {
+        'find_channels': youtube_service.find_channels,
+        'update_video_counts': youtube_service.update_video_counts,
+        'refresh_metadata': youtube_service.refresh_channel_metadata,
+    }
+
+
+def enqueue_job(conn, job_type, params, max_attempts=None):
+    """Naya job 'pending' status ke saath jobs table mein daalta hai aur uska id lautata hai।"""
+    with conn.cursor() as cur:
+        cur.execute("""
+            INSERT INTO jobs (job_type, params, status, max_attempts)
+            VALUES (%s, %s, 'pending', %s)
+            RETURNING id;
+        """, (job_type, json.dumps(params), max_attempts or JOB_MAX_ATTEMPTS))
+        job_id = cur.fetchone()[0]
+    conn.commit()
+    return job_id
+
+
+def claim_job(conn, worker_id):
+    """
+    Agla pending job 'running' mark karke lautata hai. FOR UPDATE SKIP LOCKED ki wajah se
+    kai processes / nodes ek saath claim karein to bhi ek job sirf ek worker ko milta hai।
+    """
+    with conn.cursor() as cur:
+        cur.execute("""
+            UPDATE jobs
+            SET status = 'running', started_at = CURRENT_TIMESTAMP, heartbeat_at = CURRENT_TIMESTAMP,
+                attempts = attempts + 1, worker_id = %s
+            WHERE id = (
+                SELECT id FROM jobs
+                WHERE status = 'pending' AND run_after <= CURRENT_TIMESTAMP
+                ORDER BY id
+                FOR UPDATE SKIP LOCKED
+                LIMIT 1
+            )
+            RETURNING id, job_type, params, attempts, max_attempts;
+        """, (worker_id,))
+        row = cur.fetchone()
+    conn.commit()
+    return row
+
+
+def complete_job(conn, job_id):
+    with conn.cursor() as cur:
+        cur.execute("""
+            UPDATE jobs SET status = 'done', finished_at = CURRENT_TIMESTAMP, last_error = NULL
+            WHERE id = %s;
+        """, (job_id,))
+    conn.commit()
+
+
+def fail_job(conn, job_id, attempts, max_attempts, error):
+    """Attempts bache hon to job ko backoff ke baad dobara chalne ke liye 'pending' kar deta hai।"""
+    with conn.cursor() as cur:
+        if attempts < max_attempts:
+            cur.execute("""
+                UPDATE jobs
+                SET status = 'pending', last_error = %s,
+                    run_after = CURRENT_TIMESTAMP + make_interval(secs => %s)
+                WHERE id = %s;
+            """, (error, JOB_RETRY_BACKOFF * attempts, job_id))
+        else:
+            cur.execute("""
+                UPDATE jobs SET status = 'failed', finished_at = CURRENT_TIMESTAMP, last_error = %s
+                WHERE id = %s;
+            """, (error, job_id))
+    conn.commit()
+
+
+def pause_job(conn, job_id, message, resume_after=None):
+    """Job ko rokta hai। Pause hone se attempt ginti mein nahi aata।"""
+    with conn.cursor() as cur:
+        if resume_after is not None:
+            cur.execute("""
+                UPDATE jobs SET status = 'pending', attempts = GREATEST(attempts - 1, 0), run_after = %s, last_error = %s
+                WHERE id = %s;
+            """, (resume_after, message, job_id))
+        else:
+            cur.execute("""
+                UPDATE jobs SET status = 'paused', attempts = GREATEST(attempts - 1, 0), last_error = %s
+                WHERE id = %s;
+            """, (message, job_id))
+    conn.commit()
+
+
+def resume_job(conn, job_id):
+    """Paused/failed job ko uske checkpoint se aage chalane ke liye queue mein daalta hai।"""
+    with conn.cursor() as cur:
+        cur.execute("""
+            UPDATE jobs
+            SET status = 'pending', attempts = 0, run_after = CURRENT_TIMESTAMP, finished_at = NULL
+            WHERE id = %s AND status IN ('paused', 'failed', 'pending');
+        """, (job_id,))
+        updated = cur.rowcount
+    conn.commit()
+    return updated
+
+
+def load_checkpoint(conn, job_id):
+    with conn.cursor() as cur:
+        cur.execute("SELECT checkpoint FROM jobs WHERE id = %s", (job_id,))
+        row = cur.fetchone()
+    return (row[0] if row else None) or {}
+
+
+def save_checkpoint_entry(cur, job_id, section, key, value):
+    """
+    Checkpoint ke `section` mein sirf ek `key` badalta hai (jaise ek keyword ki state)।
+    Kai threads apni-apni entry likhein to bhi ek doosre ki entry overwrite nahi hoti। Commit caller karta hai।
+    """
+    cur.execute("""
+        UPDATE jobs SET checkpoint = jsonb_set(
+            COALESCE(checkpoint, '{}'::jsonb) || jsonb_build_object(%(section)s::text, COALESCE(checkpoint -> %(section)s, '{}'::jsonb)),
+            ARRAY[%(section)s, %(key)s]::text[], %(value)s::jsonb
+        )
+        WHERE id = %(job_id)s
+    """, {'section': section, 'key': key, 'value': json.dumps(value), 'job_id': job_id})
+
+
+def update_progress(cur, job_id, progress):
+    """Progress counters (jaise pages_fetched, channels_saved) job row mein merge karta hai। Commit caller karta hai।"""
+    cur.execute(
+        "UPDATE jobs SET progress = COALESCE(progress, '{}'::jsonb) || %s::jsonb WHERE id = %s",
+        (json.dumps(progress), job_id)
+    )
+
+
+def get_job_status(conn, job_id):
+    """Job ka status aur progress JSON-friendly dict mein (job na ho to None)।"""
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT id, job_type, status, attempts, max_attempts, progress, last_error,
+                   created_at, started_at, finished_at, run_after
+            FROM jobs WHERE id = %s
+        """, (job_id,))
+        row = cur.fetchone()
+    conn.rollback()
+    if row is None:
+        return None
+    job_id, job_type, status, attempts, max_attempts, progress, last_error = row[:7]
+    timestamps = dict(zip(('created_at', 'started_at', 'finished_at', 'run_after'), row[7:]))
+    return dict(
+        {name: value.isoformat() if value else None for name, value in timestamps.items()},
+        id=job_id, job_type=job_type, status=status, attempts=attempts, max_attempts=max_attempts,
+        progress=progress or {},
+        # Poora traceback nahi, sirf aakhri line (asli error message)
+        last_error=last_error.strip().splitlines()[-1] if last_error and last_error.strip() else None,
+    )
+
+
+_status_cache = {}
+_status_cache_lock = threading.Lock()
+
+
+def cached_job_status(job_id, ttl=None):
+    """
+    get_job_status ka process-level TTL cache: kai browser tabs ek hi job poll karein to bhi
+    har `ttl` seconds mein sirf ek query hoti hai, aur cache hit par pool se connection nahi liya jata।
+    """
+    ttl = JOB_STATUS_CACHE_TTL if ttl is None else ttl
+    now = time.monotonic()
+    with _status_cache_lock:
+        cached = _status_cache.get(job_id)
+        if cached and cached[1] > now:
+            return cached[0]
+
+    with db.connection() as conn:
+        status = get_job_status(conn, job_id)
+    with _status_cache_lock:
+        for key in [key for key, (_, expires) in _status_cache.items() if expires <= now]:
+            del _status_cache[key]
+        _status_cache[job_id] = (status, now + ttl)
+    return status
+
+
+def retry_job(conn, job_id):
+    """Finished/failed job ko shuru se (checkpoint hata kar) dobara queue mein daalta hai। Affected rows ki ginti lautata hai।"""
+    with conn.cursor() as cur:
+        cur.execute("""
+            UPDATE jobs
+            SET status = 'pending', attempts = 0, run_after = CURRENT_TIMESTAMP, finished_at = NULL, checkpoint = NULL, progress = NULL
+            WHERE id = %s AND status IN ('failed', 'done');
+        """, (job_id,))
+        updated = cur.rowcount
+    conn.commit()
+    return updated
+
+
+def enqueue_periodic_jobs(conn):
+    """
+    PERIODIC_JOBS mein jo job type due ho (aur pehle se pending/running/paused na ho), use queue karta hai।
+    Aakhri baar ka samay app_state mein hai aur conditional upsert se badalta hai, isliye kai workers
+    ek saath check karein to bhi ek interval mein ek hi job banta hai। Naye job ids lautata hai।
+    """
+    job_ids = []
+    for job_type, interval in PERIODIC_JOBS.items():
+        if interval <= 0:
+            continue
+        with conn.cursor() as cur:
+            cur.execute("""
+                INSERT INTO app_state (key, value) VALUES (%(key)s, CURRENT_TIMESTAMP::text)
+                ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value
+                WHERE app_state.value::timestamptz <= CURRENT_TIMESTAMP - make_interval(secs => %(interval)s)
+                RETURNING key;
+            """, {'key': f"periodic_job:{job_type}", 'interval': interval})
+            due = cur.fetchone() is not None
+            if due:
+                cur.execute("""
+                    INSERT INTO jobs (job_type, params, status, max_attempts)
+                    SELECT %(job_type)s, '{}'::jsonb, 'pending', %(max_attempts)s
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM jobs WHERE job_type = %(job_type)s AND status IN ('pending', 'running', 'paused')
+                    )
+                    RETURNING id;
+                """, {'job_type': job_type, 'max_attempts': JOB_MAX_ATTEMPTS})
+                row = cur.fetchone()
+                if row:
+                    job_ids.append(row[0])
+                    print(f"LOG: Periodic job #{row[0]} ({job_type}) queue hua।")
+        conn.commit()
+    return job_ids
+
+
+def requeue_stale_jobs(conn):
+    """
+    Jin 'running' jobs ka worker mar gaya (restart/crash), unhe wapas 'pending' kar deta hai।
+    Jo job apne saare attempts mein worker ko hi maar de (OOM, segfault, kharab input), use
+    baar-baar claim hone ki jagah 'failed' kar diya jata hai।
+    """
+    stale_sql = "status = 'running' AND heartbeat_at < CURRENT_TIMESTAMP - make_interval(secs => %(stale_after)s)"
+    params = {'stale_after': JOB_STALE_AFTER}
+    with conn.cursor() as cur:
+        cur.execute(f"""
+            UPDATE jobs
+            SET status = 'failed', finished_at = CURRENT_TIMESTAMP,
+                last_error = 'Worker ' || COALESCE(worker_id, '?') || ' ka heartbeat ruk gaya (attempt '
+                             || attempts || '/' || max_attempts || '); attempts khatam।'
+            WHERE {stale_sql} AND attempts >= max_attempts
+            RETURNING id;
+        """, params)
+        failed = [row[0] for row in cur.fetchall()]
+        cur.execute(f"""
+            UPDATE jobs
+            SET status = 'pending', run_after = CURRENT_TIMESTAMP
+            WHERE {stale_sql};
+        """, params)
+        requeued = cur.rowcount
+    conn.commit()
+    for job_id in failed:
+        print(f"ERROR: Job #{job_id} ka worker har attempt mein ruk gaya। Job 'failed' mark kiya gaya।")
+    return requeued
+
+
+def _heartbeat_loop(job_id, stop_event):
+    while not stop_event.wait(JOB_HEARTBEAT_INTERVAL):
+        try:
+            with db.connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute("UPDATE jobs SET heartbeat_at = CURRENT_TIMESTAMP WHERE id = %s", (job_id,))
+                conn.commit()
+        except Exception as e:
+            print(f"LOG: Job #{job_id} ka heartbeat update nahi ho saka: {e}")
+
+
+def run_job(job_id, job_type, params):
+    handler = _get_handlers().get(job_type)
+    if handler is None:
+        raise ValueError(f"Anjaan job type: {job_type}")
+    stop_event = threading.Event()
+    heartbeat = threading.Thread(target=_heartbeat_loop, args=(job_id, stop_event), daemon=True)
+    heartbeat.start()
+    try:
+        # Checkpoint rakhne wale handlers (jaise find_channels) ko apna job id chahiye
+        if 'job_id' in inspect.signature(handler).parameters:
+            handler(job_id=job_id, **params)
+        else:
+            handler(**params)
+    finally:
+        stop_event.set()
+        heartbeat.join()
+
+
+def run_worker(worker_id, stop_event=None):
+    """Ek worker process ka loop: job claim karo, chalao, result likho।"""
+    stop_event = stop_event or threading.Event()
+    print(f"LOG: Worker '{worker_id}' shuru hua।")
+    next_periodic_check = 0.0
+    while not stop_event.is_set():
+        try:
+            with db.connection() as conn:
+                requeue_stale_jobs(conn)
+                if time.monotonic() >= next_periodic_check:
+                    enqueue_periodic_jobs(conn)
+                    next_periodic_check = time.monotonic() + PERIODIC_CHECK_INTERVAL
+                job = claim_job(conn, worker_id)
+        except Exception as e:
+            print(f"ERROR: Worker '{worker_id}' job claim nahi kar saka: {e}")
+            stop_event.wait(JOB_POLL_INTERVAL)
+            continue
+
+        if job is None:
+            stop_event.wait(JOB_POLL_INTERVAL)
+            continue
+
+        job_id, job_type, params, attempts, max_attempts = job
+        print(f"LOG: Worker '{worker_id}' ne job #{job_id} ({job_type}, attempt {attempts}/{max_attempts}) uthaya।")
+        started = time.perf_counter()
+        try:
+            run_job(job_id, job_type, params or {})
+        except JobPaused as e:
+            outcome = 'paused'
+            print(f"LOG: Job #{job_id} ruk gaya: {e}")
+            with db.connection() as conn:
+                pause_job(conn, job_id, str(e), e.resume_after)
+        except Exception as e:
+            outcome = 'failed'
+            print(f"ERROR: Job #{job_id} fail hua: {e}")
+            with db.connection() as conn:
+                fail_job(conn, job_id, attempts, max_attempts, traceback.format_exc())
+        else:
+            outcome = 'done'
+            with db.connection() as conn:
+                complete_job(conn, job_id)
+            print(f"SUCCESS: Job #{job_id} poora hua।")
+        elapsed = time.perf_counter() - started
+        JOBS_FINISHED.inc(job_type=job_type, outcome=outcome)
+        JOB_DURATION_SECONDS.observe(elapsed, job_type=job_type)
+        metrics.log_event('job_finished', job_id=job_id, job_type=job_type, outcome=outcome,
+                          attempt=attempts, seconds=round(elapsed, 2))
+    print(f"LOG: Worker '{worker_id}' band ho raha hai।")
+
+
+def _worker_process_main(index):
+    from dotenv import load_dotenv
+    load_dotenv()
+    metrics.configure_logging()
+    # Pool itna bada ho ki keyword / video count threads connection ke liye timeout na karein
+    from app.services import youtube_service
+    db.require_connections(youtube_service.required_db_connections())
+    if WORKER_METRICS_PORT:
+        metrics.serve_metrics(WORKER_METRICS_PORT + index)
+    stop_event = threading.Event()
+    # SIGTERM par current job poora hone ke baad worker ruk jata hai
+    signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+    signal.signal(signal.SIGINT, lambda *_: stop_event.set())
+    run_worker(f"{socket.gethostname()}:{os.getpid()}:{index}", stop_event)
+
+
+def run_worker_pool(concurrency=None):
+    """
+    `concurrency` worker processes chalata hai। Har node par yeh chalane se throughput
+    processes aur nodes ke saath badhta hai, kyunki claim SKIP LOCKED se hota hai।
+    """
+    concurrency = concurrency or JOB_WORKER_CONCURRENCY
+    # Web process inhe kabhi import nahi karta; yahan fork se pehle ek baar load hote hain
+    _get_handlers()
+    from app.services import youtube_clients
+    youtube_clients.preload()
+    processes = [multiprocessing.Process(target=_worker_process_main, args=(i,)) for i in range(concurrency)]
+    for process in processes:
+        process.start()
+
+    def _shutdown(*_):
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    signal.signal(signal.SIGTERM, _shutdown)
+    signal.signal(signal.SIGINT, _shutdown)
+    for process in processes:
+        process.join()
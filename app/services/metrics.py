@@ -0,0 +1,195 @@
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger('youtubers')
+
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+# Seconds mein latency buckets (API calls aur DB writes ke liye)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+# Poore jobs ke liye (minutes se ghanton tak)
+JOB_DURATION_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600, 7200)
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+_registry = {}
+_gauge_callbacks = {}
+_registry_lock = threading.Lock()
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labelnames, values, extra=()):
+    pairs = list(zip(labelnames, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+class Counter:
+    """Sirf badhne wali ginti (jaise API calls, save hue channels), labels ke hisaab se alag-alag।"""
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        with self._lock:
+            values = dict(self._values)
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {value}" for key, value in sorted(values.items())]
+
+
+class Histogram:
+    """Latency jaise values ko buckets mein ginta hai (Prometheus histogram)।"""
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # label values -> [bucket counts..., +Inf count, sum]
+        self._values = {}
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            state[index] += 1
+            state[-1] += value
+
+    def summary(self, **labels):
+        """Ek label set ke liye (count, sum) - benchmarks aur reports ke liye।"""
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            state = self._values.get(key)
+            return (sum(state[:-1]), state[-1]) if state else (0, 0.0)
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def render(self):
+        with self._lock:
+            values = {key: list(state) for key, state in self._values.items()}
+        lines = []
+        for key, state in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), state[:-1]):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, [('le', bound)])} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {state[-1]}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+def _register(metric):
+    with _registry_lock:
+        existing = _registry.get(metric.name)
+        if existing is not None:
+            return existing
+        _registry[metric.name] = metric
+        return metric
+
+
+def counter(name, documentation, labelnames=()):
+    """Naam se counter lautata hai; pehle se bana ho to wahi (modules dobara import hon to bhi ek hi metric)।"""
+    return _register(Counter(name, documentation, labelnames))
+
+
+def histogram(name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+    return _register(Histogram(name, documentation, labelnames, buckets))
+
+
+def gauge_callback(name, documentation, label, callback):
+    """
+    Render ke waqt `callback()` ka dict ({label value: number}) gauge ke roop mein likha jata hai।
+    Pool stats jaisi cheezon ke liye, jinki value pehle se kahin aur rakhi hai।
+    """
+    with _registry_lock:
+        _gauge_callbacks[name] = (documentation, label, callback)
+
+
+def render_prometheus():
+    """Sabhi metrics Prometheus text format mein।"""
+    with _registry_lock:
+        metrics = list(_registry.values())
+        gauges = dict(_gauge_callbacks)
+    lines = []
+    for metric in metrics:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.render())
+    for name, (documentation, label, callback) in gauges.items():
+        try:
+            values = callback() or {}
+        except Exception as e:
+            logger.warning("metrics gauge_failed name=%s error=%r", name, e)
+            continue
+        lines.append(f"# HELP {name} {documentation}")
+        lines.append(f"# TYPE {name} gauge")
+        lines.extend(
+            f"{name}{_format_labels((label,), (key,))} {value}"
+            for key, value in sorted(values.items()) if isinstance(value, (int, float))
+        )
+    return '\n'.join(lines) + '\n'
+
+
+def configure_logging(level=None):
+    """Web aur worker dono process shuru hote hi ise call karte hain (LOG_LEVEL env se level)।"""
+    logging.basicConfig(
+        level=getattr(logging, (level or LOG_LEVEL), logging.INFO),
+        format='%(asctime)s %(levelname)s %(processName)s/%(threadName)s %(name)s %(message)s',
+    )
+
+
+def log_event(event, level=logging.INFO, **fields):
+    """Structured log line: `event key=value ...`, taaki grep/log tools se filter ho sake।"""
+    if logger.isEnabledFor(level):
+        logger.log(level, "%s %s", event, ' '.join(f"{key}={value!r}" for key, value in fields.items()))
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = render_prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', PROMETHEUS_CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve_metrics(port, host='0.0.0.0'):
+    """Worker process ke metrics ek chhote HTTP server par (daemon thread) /metrics se deta hai।"""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+    print(f"LOG: Worker metrics http://{host}:{port}/metrics par available hain।")
+    return server
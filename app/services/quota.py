@@ -0,0 +1,251 @@
+import hashlib
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+from app.services import db, metrics
+
+try:
+    from zoneinfo import ZoneInfo
+    QUOTA_TIMEZONE = ZoneInfo('America/Los_Angeles')
+except Exception:
+    # tzdata na ho to Pacific Standard Time se kaam chala lete hain
+    QUOTA_TIMEZONE = timezone(timedelta(hours=-8))
+
+# YouTube Data API v3 ki unit cost (https://developers.google.com/youtube/v3/determine_quota_cost)
+API_UNIT_COSTS = {
+    'search': 100,
+    'channels': 1,
+    'videos': 1,
+    'playlistItems': 1,
+}
+
+DAILY_QUOTA_PER_KEY = int(os.getenv('YOUTUBE_DAILY_QUOTA', 10000))
+# Token bucket: har key par itne units/second refill hote hain, aur itne units tak burst ho sakta hai
+QUOTA_REFILL_PER_SECOND = float(os.getenv('YOUTUBE_QUOTA_REFILL_PER_SECOND', 100))
+QUOTA_BURST = float(os.getenv('YOUTUBE_QUOTA_BURST', 500))
+QUOTA_FLUSH_INTERVAL = float(os.getenv('YOUTUBE_QUOTA_FLUSH_INTERVAL', 10))
+
+
+class QuotaExhaustedError(Exception):
+    """Jab kisi bhi API key mein aaj ke liye zaroori quota na bacha ho."""
+
+
+def quota_day(now=None):
+    """YouTube quota Pacific time ki midnight par reset hota hai।"""
+    now = now or datetime.now(timezone.utc)
+    return now.astimezone(QUOTA_TIMEZONE).strftime('%Y-%m-%d')
+
+
+def next_quota_reset(now=None):
+    """Agli Pacific midnight (jab sabhi keys ka quota wapas aata hai) ka aware datetime।"""
+    now = (now or datetime.now(timezone.utc)).astimezone(QUOTA_TIMEZONE)
+    tomorrow = (now + timedelta(days=1)).date()
+    return datetime(tomorrow.year, tomorrow.month, tomorrow.day, tzinfo=QUOTA_TIMEZONE)
+
+
+def key_id(api_key):
+    # app_state mein poori key store nahi karte, sirf uska hash
+    return hashlib.sha256(api_key.encode()).hexdigest()[:12]
+
+
+class QuotaScheduler:
+    """
+    Har API key ke liye do bucket rakhta hai: aaj ka bacha hua daily quota, aur ek
+    token bucket jo thode samay mein bahut zyada calls ko smooth karta hai।
+    `acquire` sabse zyada bache quota wali key deta hai, aur capacity na ho to wait karta hai।
+    """
+    def __init__(self, api_keys, daily_quota=DAILY_QUOTA_PER_KEY, refill_per_second=QUOTA_REFILL_PER_SECOND,
+                 burst=QUOTA_BURST, persist=True):
+        self.api_keys = list(api_keys)
+        self.daily_quota = daily_quota
+        self.refill_per_second = refill_per_second
+        # Bucket itna bada hona chahiye ki sabse mehngi call (search = 100) ek baar mein ho sake
+        self.capacity = max(burst, max(API_UNIT_COSTS.values()))
+        self.persist = persist
+        self._cond = threading.Condition()
+        self._day = quota_day()
+        self._used = defaultdict(int)
+        self._unflushed = defaultdict(int)
+        self._disabled = set()
+        now = time.monotonic()
+        self._tokens = {key: self.capacity for key in self.api_keys}
+        self._refilled_at = {key: now for key in self.api_keys}
+        self._last_flush = now
+        if self.persist:
+            self._load_usage()
+
+    # --- Persistence (app_state) ---
+
+    def _state_key(self, day, api_key):
+        return f"quota_usage:{day}:{key_id(api_key)}"
+
+    def _load_usage(self):
+        try:
+            with db.connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT key, value FROM app_state WHERE key LIKE %s", (f"quota_usage:{self._day}:%",))
+                    stored = dict(cur.fetchall())
+                conn.rollback()
+        except Exception as e:
+            print(f"LOG: Quota usage load nahi ho saka, zero se shuru kar rahe hain: {e}")
+            return
+        for api_key in self.api_keys:
+            value = stored.get(self._state_key(self._day, api_key))
+            if value is not None:
+                self._used[api_key] = int(value)
+
+    def flush(self):
+        """Local kharch ko app_state mein jodta hai aur doosre processes ka kharch wapas padhta hai।"""
+        if not self.persist:
+            return
+        with self._cond:
+            deltas = {key: delta for key, delta in self._unflushed.items() if delta}
+            self._unflushed = defaultdict(int)
+            self._last_flush = time.monotonic()
+            day = self._day
+        if not deltas:
+            return
+
+        totals = {}
+        try:
+            with db.connection() as conn:
+                with conn.cursor() as cur:
+                    for api_key, delta in deltas.items():
+                        cur.execute("""
+                            INSERT INTO app_state (key, value) VALUES (%s, %s)
+                            ON CONFLICT (key) DO UPDATE
+                            SET value = (app_state.value::bigint + EXCLUDED.value::bigint)::text
+                            RETURNING value;
+                        """, (self._state_key(day, api_key), str(delta)))
+                        totals[api_key] = int(cur.fetchone()[0])
+                conn.commit()
+        except Exception as e:
+            print(f"LOG: Quota usage save nahi ho saka, agli baar koshish karenge: {e}")
+            with self._cond:
+                if self._day == day:
+                    for api_key, delta in deltas.items():
+                        self._unflushed[api_key] += delta
+            return
+
+        with self._cond:
+            if self._day == day:
+                for api_key, total in totals.items():
+                    self._used[api_key] = max(self._used[api_key], total + self._unflushed[api_key])
+
+    # --- Scheduling ---
+
+    def _roll_day(self):
+        today = quota_day()
+        if today != self._day:
+            self._day = today
+            self._used = defaultdict(int)
+            self._unflushed = defaultdict(int)
+            self._disabled.clear()
+
+    def _refill(self, api_key, now):
+        elapsed = now - self._refilled_at[api_key]
+        self._tokens[api_key] = min(self.capacity, self._tokens[api_key] + elapsed * self.refill_per_second)
+        self._refilled_at[api_key] = now
+
+    def remaining(self, api_key):
+        return max(0, self.daily_quota - self._used[api_key])
+
+    def acquire(self, cost, timeout=None):
+        """
+        `cost` units ke liye ek API key reserve karta hai aur use lautata hai।
+        Rate bucket khali ho to capacity aane tak wait karta hai; kisi key mein daily quota
+        na bacha ho to QuotaExhaustedError deta hai।
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                self._roll_day()
+                now = time.monotonic()
+                candidates = [
+                    key for key in self.api_keys
+                    if key not in self._disabled and self.remaining(key) >= cost
+                ]
+                if not candidates:
+                    raise QuotaExhaustedError("Sabhi API keys ka aaj ka quota khatam ho gaya hai।")
+
+                for key in candidates:
+                    self._refill(key, now)
+                ready = [key for key in candidates if self._tokens[key] >= cost]
+                if ready:
+                    api_key = max(ready, key=self.remaining)
+                    self._tokens[api_key] -= cost
+                    self._used[api_key] += cost
+                    self._unflushed[api_key] += cost
+                    flush_due = now - self._last_flush >= QUOTA_FLUSH_INTERVAL
+                    break
+
+                # Sabse jaldi bharne wali bucket tak wait karein
+                wait = min((cost - self._tokens[key]) / self.refill_per_second for key in candidates)
+                if deadline is not None:
+                    if now >= deadline:
+                        raise TimeoutError(f"{timeout}s mein {cost} quota units ki capacity nahi mili।")
+                    wait = min(wait, deadline - now)
+                self._cond.wait(wait)
+
+        if flush_due:
+            self.flush()
+        return api_key
+
+    def mark_exhausted(self, api_key):
+        """API ne quotaExceeded diya: is key ko aaj ke liye khatam maan lo (aur yeh save bhi ho)।"""
+        with self._cond:
+            missing = self.remaining(api_key)
+            self._used[api_key] += missing
+            self._unflushed[api_key] += missing
+            self._cond.notify_all()
+        self.flush()
+
+    def disable(self, api_key):
+        """Invalid / blocked key ko is process mein aage istemal nahi karte।"""
+        with self._cond:
+            self._disabled.add(api_key)
+            self._cond.notify_all()
+
+    def snapshot(self):
+        with self._cond:
+            self._roll_day()
+            return {
+                key_id(api_key): {
+                    'used': self._used[api_key],
+                    'remaining': self.remaining(api_key),
+                    'disabled': api_key in self._disabled,
+                }
+                for api_key in self.api_keys
+            }
+
+
+_schedulers = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_scheduler(api_keys):
+    """Ek process mein ek hi key-set ke liye ek hi scheduler (sabhi threads aur jobs ke beech shared)।"""
+    cache_key = tuple(api_keys)
+    with _schedulers_lock:
+        scheduler = _schedulers.get(cache_key)
+        if scheduler is None:
+            scheduler = QuotaScheduler(api_keys)
+            _schedulers[cache_key] = scheduler
+        return scheduler
+
+
+def remaining_quota():
+    """Is process ke schedulers ke hisaab se har key (hash) ka aaj bacha hua quota; disabled key ka 0।"""
+    with _schedulers_lock:
+        schedulers = list(_schedulers.values())
+    remaining = {}
+    for scheduler in schedulers:
+        for key, state in scheduler.snapshot().items():
+            remaining[key] = 0 if state['disabled'] else state['remaining']
+    return remaining
+
+
+metrics.gauge_callback('youtube_api_quota_remaining', 'Quota units left today per API key (sha256 prefix)', 'key', remaining_quota)
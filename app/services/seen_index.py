@@ -0,0 +1,68 @@
+import os
+import threading
+
+from app.services import db
+
+# 'db': har page par channels table ki primary key se existence probe (memory table ke size par nirbhar nahi)
+# 'memory': job shuru hote hi saari channel IDs ek Python set mein (chhoti table par sabse tez)
+SEEN_INDEX_BACKEND = os.getenv('SEEN_INDEX_BACKEND', 'db').lower()
+
+
+class MemorySeenIndex:
+    """Saari maujooda channel IDs ek baar mein load karta hai। Memory aur startup table ke saath badhte hain।"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        with db.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT channel_id FROM channels")
+                self._seen = {row[0] for row in cur.fetchall()}
+            conn.rollback()
+        print(f"LOG: Database mein pehle se {len(self._seen)} channels hain।")
+
+    def claim_new(self, channel_ids):
+        """Jo IDs pehle nahi dekhi gayi, unhe 'dekha hua' mark karke lautata hai (order same rehta hai)।"""
+        with self._lock:
+            fresh = [channel_id for channel_id in dict.fromkeys(channel_ids) if channel_id not in self._seen]
+            self._seen.update(fresh)
+        return fresh
+
+
+class DatabaseSeenIndex:
+    """
+    Sirf is job mein dekhi gayi IDs memory mein rakhta hai। Baaki ke liye har page par
+    `channel_id = ANY(%s)` se primary key index probe hota hai (50 IDs ka ek chhota query)।
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._seen = set()
+
+    def claim_new(self, channel_ids):
+        with self._lock:
+            candidates = [channel_id for channel_id in dict.fromkeys(channel_ids) if channel_id not in self._seen]
+        if not candidates:
+            return []
+        with db.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT channel_id FROM channels WHERE channel_id = ANY(%s)", (candidates,))
+                existing = {row[0] for row in cur.fetchall()}
+            conn.rollback()
+        with self._lock:
+            # Probe ke dauraan kisi doosre thread ne yahi ID claim kar li ho to use chhod dete hain
+            fresh = [channel_id for channel_id in candidates if channel_id not in existing and channel_id not in self._seen]
+            self._seen.update(fresh)
+            self._seen.update(existing)
+        return fresh
+
+
+SEEN_INDEX_BACKENDS = {
+    'db': DatabaseSeenIndex,
+    'memory': MemorySeenIndex,
+}
+
+
+def make_seen_index(backend=None):
+    backend = (backend or SEEN_INDEX_BACKEND).lower()
+    if backend not in SEEN_INDEX_BACKENDS:
+        print(f"LOG: Anjaan SEEN_INDEX_BACKEND '{backend}', 'db' istemal kar rahe hain।")
+        backend = 'db'
+    return SEEN_INDEX_BACKENDS[backend]()
@@ -0,0 +1,106 @@
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+YOUTUBE_HTTP_TIMEOUT = float(os.getenv('YOUTUBE_HTTP_TIMEOUT', 30))
+
+# googleapiclient ke saath aane wala youtube v3 discovery document, process mein ek hi baar parse hota hai
+_discovery_document = None
+_document_lock = threading.Lock()
+
+# (api_key) -> youtube v3 resource। None ho to googleapiclient ka asli client banta hai।
+# Benchmarks isse fake API lagate hain (benchmarks/fake_youtube.py), taaki quota kharch na ho।
+_service_factory = None
+
+_idle_client_sets = []
+_idle_lock = threading.Lock()
+_generation = 0
+_pid = os.getpid()
+
+
+def _load_discovery_document():
+    global _discovery_document
+    with _document_lock:
+        if _discovery_document is None:
+            try:
+                from googleapiclient.discovery_cache import get_static_doc
+                document = get_static_doc('youtube', 'v3')
+            except ImportError:
+                document = None
+            _discovery_document = json.loads(document) if document else False
+        return _discovery_document or None
+
+
+def preload():
+    """
+    googleapiclient aur discovery document abhi load kar deta hai। Worker pool fork se pehle ise
+    call karta hai, taaki child processes yeh memory copy-on-write share karein aur pehla job tez chale।
+    """
+    import httplib2  # noqa: F401
+    from googleapiclient import discovery  # noqa: F401
+    _load_discovery_document()
+
+
+def _build_client(api_key, http):
+    if _service_factory is not None:
+        return _service_factory(api_key)
+    # googleapiclient bhari import hai; pehla client banne par hi load hota hai
+    from googleapiclient.discovery import build, build_from_document
+    document = _load_discovery_document()
+    if document is None:
+        # Purane googleapiclient mein static document nahi hota, tab network discovery hi rasta hai
+        return build('youtube', 'v3', developerKey=api_key, http=http, cache_discovery=False)
+    return build_from_document(document, developerKey=api_key, http=http)
+
+
+class _ClientSet:
+    """
+    Ek httplib2.Http (keep-alive HTTPS connection) aur us par bane har API key ke clients।
+    httplib2 thread-safe nahi hai, isliye ek set ek waqt mein ek hi thread ke paas rehta hai।
+    """
+    def __init__(self):
+        import httplib2
+        self.http = httplib2.Http(timeout=YOUTUBE_HTTP_TIMEOUT)
+        self.services = {}
+
+    def service(self, api_key):
+        service = self.services.get(api_key)
+        if service is None:
+            service = self.services[api_key] = _build_client(api_key, self.http)
+        return service
+
+
+@contextmanager
+def client(api_key):
+    """
+    Is process ke idle client sets mein se ek lekar `api_key` ka client deta hai, aur kaam ke baad
+    wapas rakh deta hai। Har key ka client ek hi baar banta hai aur HTTP connection sabhi keys, jobs
+    aur threads ke beech dobara istemal hota hai, isliye key badalna sirf ek dict lookup hai।
+    """
+    global _pid, _generation
+    with _idle_lock:
+        if _pid != os.getpid():
+            # Fork ke baad parent ke sockets istemal nahi karte
+            _idle_client_sets.clear()
+            _pid = os.getpid()
+            _generation += 1
+        client_set = _idle_client_sets.pop() if _idle_client_sets else None
+        generation = _generation
+    if client_set is None:
+        client_set = _ClientSet()
+    try:
+        yield client_set.service(api_key)
+    finally:
+        with _idle_lock:
+            if generation == _generation:
+                _idle_client_sets.append(client_set)
+
+
+def set_service_factory(factory):
+    """Client banane ka tarika badalta hai (None dene par wapas asli YouTube API)। Bane hue clients hata diye jaate hain।"""
+    global _service_factory, _generation
+    with _idle_lock:
+        _service_factory = factory
+        _idle_client_sets.clear()
+        _generation += 1
@@ -1,321 +1,1132 @@
 import os
-import re
+import json
+import logging
 from datetime import datetime
 import time
-from googleapiclient.discovery import build
-import psycopg2
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from googleapiclient.errors import HttpError
+from psycopg2.extras import execute_values
+from app.services import db, api_cache, channel_queries, channel_stats, job_queue, metrics, youtube_clients
+from app.services.categories import CATEGORY_KEYWORDS
+from app.services.contact_extractor import description_hash, extract_details_bulk
+from app.services.duration import count_shorts
+from app.services.seen_index import make_seen_index
+from app.services.quota import API_UNIT_COSTS, QuotaExhaustedError, get_scheduler, key_id, next_quota_reset
 
-# API Keys ko saaf karke list banayein, khali entries ko hata dein
-YOUTUBE_API_KEYS = [key.strip() for key in os.getenv('YOUTUBE_API_KEYS', '').split(',') if key.strip()]
-GEMINI_API_KEY = os.getenv('GEMINI_API_KEY') # Abhi iska istemal nahi ho raha, par rakha hai
+# Video counts job mein kitne channels ek saath process hon (quota bachane ke liye ise kam rakhein)
+VIDEO_COUNT_WORKERS = int(os.getenv('VIDEO_COUNT_WORKERS', 4))
+# find_channels mein kitne keywords ek saath search hon
+SEARCH_KEYWORD_WORKERS = int(os.getenv('SEARCH_KEYWORD_WORKERS', 4))
+# Ek batch HTTP request mein itni calls, aur ek channels/videos.list mein itni IDs (API ki hadd 50 hai)
+API_BATCH_SIZE = 50
+# find_channels: har keyword worker itne search pages aage tak laata hai jab tak pichhla page filter/save ho raha hai
+# (0 = prefetch band; limit poori hone par har worker ka zyada se zyada itna prefetch bekaar jata hai)
+SEARCH_PREFETCH_PAGES = int(os.getenv('SEARCH_PREFETCH_PAGES', 1))
+# refresh_channel_metadata: ek job mein itne channels (sabse purane retrieved_at pehle), aur ek page
+# (ek batch HTTP request + ek commit) mein itne
+METADATA_REFRESH_MAX_CHANNELS = int(os.getenv('METADATA_REFRESH_MAX_CHANNELS', 5000))
+METADATA_REFRESH_PAGE_SIZE = 500
+METADATA_REFRESH_CURSOR_KEY = 'metadata_refresh_cursor'
+# Har stage ko sirf zaroori fields, taaki response chhote rahein
+SEARCH_FIELDS = "nextPageToken,items(snippet(channelId))"
+# (snippet.localized description dobara bhejta hai aur thumbnails bhi bade hote hain; dono chhod dete hain)
+CHANNEL_DETAIL_FIELDS = "items(id,snippet(title,description,publishedAt),statistics(subscriberCount,hiddenSubscriberCount))"
+METADATA_FIELDS = "items(id,snippet(title,description),statistics(subscriberCount,hiddenSubscriberCount))"
+
+# Google API error reasons jinke hisaab se key ko chhodna ya dobara koshish karni hai
+QUOTA_ERROR_REASONS = {'quotaExceeded', 'dailyLimitExceeded'}
+RATE_LIMIT_ERROR_REASONS = {'rateLimitExceeded', 'userRateLimitExceeded'}
+INVALID_KEY_ERROR_REASONS = {'keyInvalid', 'keyExpired', 'accessNotConfigured', 'ipRefererBlocked', 'API_KEY_INVALID'}
+MAX_RATE_LIMIT_RETRIES = 5
+
+API_REQUEST_SECONDS = metrics.histogram('youtube_api_request_seconds', 'YouTube API call latency', ('resource',))
+API_REQUESTS = metrics.counter('youtube_api_requests_total', 'YouTube API calls by result (ok ya error reason)', ('resource', 'outcome'))
+API_CACHE_LOOKUPS = metrics.counter('youtube_api_cache_lookups_total', 'api_cache lookups', ('resource', 'result'))
+API_QUOTA_UNITS = metrics.counter('youtube_api_quota_units_total', 'Quota units spent per API key (sha256 prefix)', ('key', 'resource'))
+CRAWLER_PAGES = metrics.counter('crawler_search_pages_total', 'search.list pages read by find_channels', ('category',))
+CRAWLER_CHANNELS = metrics.counter('crawler_channels_total', 'Channels seen by find_channels, by outcome', ('outcome',))
+VIDEO_COUNT_CHANNELS = metrics.counter('crawler_video_count_channels_total', 'Channels handled by update_video_counts', ('outcome',))
+DB_WRITE_SECONDS = metrics.histogram('db_write_seconds', 'Time to write and commit crawler results', ('operation',))
+METADATA_REFRESH_CHANNELS = metrics.counter('crawler_metadata_refresh_channels_total', 'Channels checked by refresh_channel_metadata', ('outcome',))
+
+
+def required_db_connections():
+    """
+    Ek worker process mein ek saath zyada se zyada kitne DB connections lag sakte hain: har keyword worker
+    aur uska prefetch thread, ya har video count thread aur duration thread, ek-ek connection rakh sakta hai।
+    Upar se job ka apna connection, heartbeat thread aur ek spare।
+    """
+    search_threads = SEARCH_KEYWORD_WORKERS * (2 if SEARCH_PREFETCH_PAGES > 0 else 1)
+    video_count_threads = 2 * VIDEO_COUNT_WORKERS
+    return max(search_threads, video_count_threads) + 3
+
+
+def youtube_api_keys():
+    """
+    API Keys ko saaf karke list banata hai, khali entries hata kar। Import ke waqt nahi, pehli
+    call par padha jata hai, taaki .env load hone (aur benchmarks ke env set karne) ke baad hi padhe।
+    """
+    return [key.strip() for key in os.getenv('YOUTUBE_API_KEYS', '').split(',') if key.strip()]
+
+
+def _http_error_reason(error):
+    """HttpError ke JSON body se Google ka 'reason' (jaise quotaExceeded) nikalta hai।"""
+    try:
+        details = json.loads(error.content.decode('utf-8'))['error']
+        reason = (details.get('errors') or [{}])[0].get('reason', '')
+        message = details.get('message', '')
+    except Exception:
+        return '', ''
+    if error.resp.status == 400 and 'API key not valid' in message:
+        reason = 'keyInvalid'
+    return reason, message
 
 class YouTubeServiceManager:
-    """API Keys ko manage karne aur error par switch karne ke liye ek class."""
+    """
+    API Keys ko manage karne ke liye ek class. Har call se pehle QuotaScheduler se
+    sabse zyada bache quota wali key li jaati hai, aur quota error par woh key band ho jaati hai।
+    """
     def __init__(self, api_keys):
         if not api_keys:
             raise ValueError("YouTube API keys configure nahi hain ya khali hain.")
         self.api_keys = api_keys
+        self.scheduler = get_scheduler(api_keys)
         self.current_key_index = 0
-        self.service = self._build_service()
-
-    def _build_service(self):
-        api_key = self.api_keys[self.current_key_index]
-        print(f"LOG: YouTube client ko API Key index #{self.current_key_index} (....**{api_key[-4:]}) ke saath banaya ja raha hai.")
-        return build('youtube', 'v3', developerKey=api_key)
 
     def get_current_key(self):
         return self.api_keys[self.current_key_index]
 
-    def switch_key_and_get_service(self):
-        """Error aane par agli key par switch karta hai।"""
-        self.current_key_index = (self.current_key_index + 1) % len(self.api_keys)
-        print(f"LOG: API Key mein samasya! Agli Key index #{self.current_key_index} par switch kiya ja raha hai।")
-        self.service = self._build_service()
-        return self.service
-
-def get_db_connection():
-    return psycopg2.connect(os.getenv('DATABASE_URL'))
-
-def extract_details(description):
-    """Description se email, phone aur social media links nikalta hai।"""
-    emails = list(set(re.findall(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', description)))
-    phones = list(set(re.findall(r'(?:\+91)?[ -]?(?:[6-9]\d{2}[ -]?\d{3}[ -]?\d{4}|\d{10})', description)))
-    
-    instagram = re.search(r'(?:instagram\.com\/|ig:)([a-zA-Z0-9._]+)', description, re.IGNORECASE)
-    twitter = re.search(r'(?:twitter\.com\/|x\.com\/|@)([a-zA-Z0-9_]+)', description, re.IGNORECASE)
-    linkedin = re.search(r'(?:linkedin\.com\/in\/)([a-zA-Z0-9-]+)', description, re.IGNORECASE)
-
-    # Links ko URL format mein store karein ya sirf username
-    instagram_link = f"https://www.instagram.com/{instagram.group(1)}" if instagram else None
-    twitter_link = f"https://twitter.com/{twitter.group(1)}" if twitter else None
-    linkedin_link = f"https://www.linkedin.com/in/{linkedin.group(1)}" if linkedin else None
-    
+    def execute(self, resource, timeout=None, cache_ttl=None, **params):
+        """
+        `resource().list(**params)` call karta hai (jaise execute('search', q=...))।
+        Quota ke liye wait karta hai, quotaExceeded / invalid key par doosri key se dobara try
+        karta hai, aur koi key na bache to QuotaExhaustedError deta hai।
+        `cache_ttl` (seconds) dene par response api_cache se aata hai aur quota kharch nahi hota।
+        """
+        if cache_ttl:
+            cached = api_cache.get(resource, params)
+            API_CACHE_LOOKUPS.inc(resource=resource, result='miss' if cached is None else 'hit')
+            if cached is not None:
+                return cached
+
+        cost = API_UNIT_COSTS.get(resource, 1)
+        rate_limit_retries = 0
+        while True:
+            api_key = self.scheduler.acquire(cost, timeout=timeout)
+            self.current_key_index = self.api_keys.index(api_key)
+            API_QUOTA_UNITS.inc(cost, key=key_id(api_key), resource=resource)
+            started = time.perf_counter()
+            try:
+                # Har key ka client process-wide registry mein pehle se bana hota hai; key badalna sirf lookup hai
+                with youtube_clients.client(api_key) as service:
+                    response = getattr(service, resource)().list(**params).execute()
+                API_REQUEST_SECONDS.observe(time.perf_counter() - started, resource=resource)
+                API_REQUESTS.inc(resource=resource, outcome='ok')
+                if cache_ttl:
+                    api_cache.put(resource, params, response, cache_ttl)
+                return response
+            except HttpError as e:
+                API_REQUEST_SECONDS.observe(time.perf_counter() - started, resource=resource)
+                action = self._handle_http_error(api_key, resource, e)
+                if action == 'rate_limit' and rate_limit_retries < MAX_RATE_LIMIT_RETRIES:
+                    rate_limit_retries += 1
+                    time.sleep(2 ** rate_limit_retries)
+                elif action != 'switch_key':
+                    raise
+
+    def _handle_http_error(self, api_key, resource, error):
+        """
+        Error ke reason ke hisaab se key ko exhausted / band mark karta hai।
+        Lautata hai: 'switch_key' (doosri key se dobara), 'rate_limit' (thoda ruk kar dobara) ya None (retry nahi)।
+        """
+        reason, message = _http_error_reason(error)
+        API_REQUESTS.inc(resource=resource, outcome=reason or f'http_{error.resp.status}')
+        metrics.log_event('youtube_api_error', logging.WARNING, resource=resource, reason=reason, status=error.resp.status)
+        if reason in QUOTA_ERROR_REASONS:
+            print(f"LOG: Key index #{self.current_key_index} ka quota khatam ({reason})। Doosri key try kar rahe hain।")
+            self.scheduler.mark_exhausted(api_key)
+            return 'switch_key'
+        if reason in INVALID_KEY_ERROR_REASONS:
+            print(f"LOG: Key index #{self.current_key_index} kaam nahi kar rahi ({reason}: {message})। Ise band kar rahe hain।")
+            self.scheduler.disable(api_key)
+            return 'switch_key'
+        if reason in RATE_LIMIT_ERROR_REASONS:
+            return 'rate_limit'
+        return None
+
+    def execute_batch(self, resource, params_list, timeout=None):
+        """
+        Kai independent `resource().list(**params)` calls ek batch HTTP request (ek round trip) mein bhejta hai।
+        Har params ke liye uska response lautata hai, ya fail hui call ka HttpError (exception object)।
+        Quota / invalid key wali calls doosri key se aur rate limit wali backoff ke baad dobara jaati hain।
+        Quota har call ka alag lagta hai; batch sirf round trips bachata hai।
+        """
+        results = [None] * len(params_list)
+        cost = API_UNIT_COSTS.get(resource, 1)
+        pending = list(range(len(params_list)))
+        rate_limit_retries = 0
+        while pending:
+            chunk, pending = pending[:API_BATCH_SIZE], pending[API_BATCH_SIZE:]
+            api_key = self.scheduler.acquire(cost * len(chunk), timeout=timeout)
+            self.current_key_index = self.api_keys.index(api_key)
+            API_QUOTA_UNITS.inc(cost * len(chunk), key=key_id(api_key), resource=resource)
+            errors = {}
+
+            def _collect(request_id, response, exception):
+                if exception is None:
+                    results[int(request_id)] = response
+                else:
+                    errors[int(request_id)] = exception
+
+            started = time.perf_counter()
+            try:
+                with youtube_clients.client(api_key) as service:
+                    batch = service.new_batch_http_request(callback=_collect)
+                    for index in chunk:
+                        batch.add(getattr(service, resource)().list(**params_list[index]), request_id=str(index))
+                    batch.execute()
+            except HttpError as e:
+                # Poora batch hi fail hua (jaise key invalid)
+                errors = {index: e for index in chunk}
+            API_REQUEST_SECONDS.observe(time.perf_counter() - started, resource=f"{resource}:batch")
+            API_REQUESTS.inc(len(chunk) - len(errors), resource=resource, outcome='ok')
+
+            retry, actions, rate_limited = [], {}, False
+            for index, error in errors.items():
+                if not isinstance(error, HttpError):
+                    results[index] = error
+                    continue
+                # Ek hi reason ke liye key ek hi baar mark hoti hai
+                reason = _http_error_reason(error)[0] or error.resp.status
+                if reason not in actions:
+                    actions[reason] = self._handle_http_error(api_key, resource, error)
+                if actions[reason] == 'switch_key' or (
+                        actions[reason] == 'rate_limit' and rate_limit_retries < MAX_RATE_LIMIT_RETRIES):
+                    rate_limited = rate_limited or actions[reason] == 'rate_limit'
+                    retry.append(index)
+                else:
+                    results[index] = error
+            if rate_limited:
+                rate_limit_retries += 1
+                time.sleep(2 ** rate_limit_retries)
+            pending = retry + pending
+        return results
+
+def _record_quota_status(conn, message):
+    with conn.cursor() as cur:
+        cur.execute("INSERT INTO app_state (key, value) VALUES ('quota_status', %s) ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value;", (message,))
+    conn.commit()
+
+# --- SUDHAR: update_video_counts function implement kiya gaya hai ---
+# Manager halka object hai (asli clients aur HTTP connections youtube_clients registry mein shared hain);
+# har thread apna manager rakhta hai taaki current_key_index us thread ki aakhri key dikhaye
+_thread_local = threading.local()
+
+
+def _get_thread_manager():
+    yt_manager = getattr(_thread_local, 'yt_manager', None)
+    if yt_manager is None:
+        yt_manager = YouTubeServiceManager(youtube_api_keys())
+        _thread_local.yt_manager = yt_manager
+    return yt_manager
+
+
+def _fetch_video_durations(video_ids):
+    """Ek videos().list call se 50 tak videos ki durations lata hai (duration worker thread mein chalta hai)।"""
+    return list(_fetch_video_durations_by_id(video_ids).values())
+
+
+def _fetch_video_durations_by_id(video_ids):
+    """Jaisa _fetch_video_durations, par {video_id: duration} (kai channels ki IDs ek call mein hon tab)।"""
+    video_response = _get_thread_manager().execute(
+        'videos',
+        part="contentDetails",
+        id=",".join(video_ids)
+    )
+    return {video_item['id']: video_item['contentDetails']['duration'] for video_item in video_response.get('items', [])}
+
+
+def _video_count_cursor(state, full_refresh):
+    """Incremental mode tabhi jab pichhli ginti aur cursor dono maujood hon। Lautata hai: (incremental, last_video_id, last_published_at)।"""
+    incremental = (not full_refresh and state.get('last_video_id') is not None
+                   and state.get('short_videos_count') is not None and state.get('long_videos_count') is not None)
+    if not incremental:
+        return False, None, None
+    return True, state.get('last_video_id'), state.get('last_video_published_at')
+
+
+def _scan_playlist_page(playlist_response, last_video_id, last_published_at):
+    """
+    Uploads playlist ka ek page padhta hai। Lautata hai: (naye video IDs, pehla (sabse naya) video
+    (id, published_at) ya None, kya pehle se gine hue videos tak pahunch gaye)।
+    """
+    video_ids = []
+    newest = None
+    for playlist_item in playlist_response.get('items', []):
+        details = playlist_item['contentDetails']
+        published_at = _parse_api_timestamp(details.get('videoPublishedAt'))
+        if newest is None:
+            newest = (details['videoId'], published_at)
+        # Pichhli baar ka sabse naya video (ya usse purana) aa gaya, to aage sab gina hua hai
+        if details['videoId'] == last_video_id or (
+                last_published_at and published_at and published_at <= last_published_at):
+            return video_ids, newest, True
+        video_ids.append(details['videoId'])
+    return video_ids, newest, False
+
+
+def _video_count_result(state, channel_name, uploads_playlist_id, incremental, durations, newest,
+                        last_video_id, last_published_at):
+    shorts_count = state['short_videos_count'] if incremental else 0
+    long_videos_count = state['long_videos_count'] if incremental else 0
+    # Poore batch ko ek saath classify karte hain (threshold: SHORTS_MAX_SECONDS)
+    batch_shorts, batch_long = count_shorts(durations)
+    newest_video_id, newest_published_at = newest or (None, None)
     return {
-        "emails": ", ".join(emails), 
-        "phones": ", ".join(phones),
-        "instagram_link": instagram_link,
-        "twitter_link": twitter_link,
-        "linkedin_link": linkedin_link,
+        'channel_name': channel_name,
+        'short_videos_count': shorts_count + batch_shorts,
+        'long_videos_count': long_videos_count + batch_long,
+        'uploads_playlist_id': uploads_playlist_id,
+        # Koi naya video na mile to purana cursor hi rehne dein
+        'last_video_id': newest_video_id or last_video_id,
+        'last_video_published_at': newest_published_at or last_published_at,
     }
 
-# SUDHAR: CATEGORY_KEYWORDS को और ज़्यादा हिंदी/Hinglish शब्दों के साथ विस्तृत और लक्षित (targeted) बनाया गया है
-CATEGORY_KEYWORDS = {
-    "Technology": "hindi tech, gadgets review, unboxing, mobile review, laptop review, tech news india, smartphone tips, android tricks, iphone tricks, programming hindi, python hindi, pc build india, latest gadgets, ai explained hindi, software development, cyber security awareness, tech tips and tricks, saste gadgets, tech channel",
-    "Gaming": "gaming india, live gameplay, mobile gaming, pc games, bgmi live, valorant india, free fire gameplay, gta v hindi, minecraft hindi, gaming shorts, gaming channel, best android games, gaming pc build, ps5 india, pro gamer, gaming highlights, game walkthrough hindi, op gameplay",
-    "Finance": "stock market india, personal finance, investing for beginners, mutual funds sahi hai, share market live, sip investment, cryptocurrency india, bitcoin hindi, how to save money, credit card tips, budgeting tips hindi, business ideas, startup india, case study hindi, make money online, nifty 50, intraday trading",
-    "Education": "educational channel, study iq, online learning india, upsc preparation, ssc cgl, neet motivation, jee mains, current affairs 2025, gk in hindi, skill development, english speaking course, communication skills, history in hindi, science experiments, amazing facts, knowledge video, class 12",
-    "Comedy": "hindi comedy, funny video, vines, stand up comedy, comedy sketch, funny roast, prank video india, desi comedy, animation comedy, mimicry, funny dubbing, bhojpuri comedy, haryanvi comedy, comedy shorts",
-    "Vlogging": "daily vlog, lifestyle vlog, travel vlogger india, india travel vlog, mountain vlog, goa vlog, budget travel, moto vlogging india, food vlog, shopping haul, village life vlog, family vlog, couple vlog, a day in my life, my first vlog",
-    "YouTube related": "1000 subscribers kaise kare, 4000 watch time kaise kare, youtube channel grow kaise kare, video viral kaise kare, views kaise laye, subscribers jaldi kaise badhaye, youtube par safal kaise ho, youtube seo tips hindi, youtube channel monetization, content creator tips, creator economy, youtube algorithm explained, youtube channel audit, tubebuddy tutorial, vidiq tutorial, thumbnail creation tutorial, video editing for creators, best editing app for youtube, youtube shorts monetization, copyright policy explained, adsense setup hindi, youtube se paise kaise kamaye, online kamai youtube, youtube se kitna paisa milta hai, youtube ka paisa, youtube ki first payment, youtube earning proof, youtube video par tags kaise lagaye, youtube channel setting, youtube channel customize kaise kare, ranking tags for youtube, canva tutorial for youtube thumbnail, zero se youtube channel kaise banaye, youtube par views kaise badhaye, video upload karne ka sahi tarika, youtube studio use karna, best mic for youtube hindi, best camera for youtube hindi, youtube channel ka naam kaise rakhe, youtube channel delete kaise kare, video edit kaise kare, live stream kaise kare, youtube short video viral kaise kare, youtube ka naya update, youtube monetization ke naye rules"
-}
 
+def _count_channel_videos(channel_id, state, duration_executor, full_refresh=False, first_page=None):
+    """
+    Ek channel ke Shorts aur Long videos ginta hai। Playlist ka agla page fetch hote samay
+    pichhle page ki durations duration_executor par parallel mein fetch hoti hain।
 
-# --- SUDHAR: update_video_counts function implement kiya gaya hai ---
-def update_video_counts(channel_ids):
-    """Chune hue channels ke Shorts aur Long Videos ki ginti karta hai।"""
-    print(f"\n--- Update Video Counts Job Shuru Hua ({len(channel_ids)} channels) ---")
-    
-    try:
-        yt_manager = YouTubeServiceManager(YOUTUBE_API_KEYS)
-    except ValueError as e:
-        print(f"FATAL ERROR: {e}")
-        return
+    `state` mein pichhli run ka cursor hota hai (uploads playlist, sabse naya gina hua video
+    aur tab tak ki ginti)। Cursor ho to sirf naye uploads padhe jaate hain aur jaise hi pehle
+    se gina hua video aata hai, paging ruk jaati hai। `first_page` (batch mein pehle se aaya
+    playlistItems response) ho to pehla page dobara fetch nahi hota। Channel na mile to None lautata hai।
+    """
+    yt_manager = _get_thread_manager()
+    state = state or {}
+    channel_name = state.get('channel_name') or channel_id
+    uploads_playlist_id = state.get('uploads_playlist_id')
+
+    # 1. Uploads playlist ID pehle se save na ho to channel details se nikalna
+    if not uploads_playlist_id:
+        channel_response = yt_manager.execute(
+            'channels',
+            part="contentDetails,snippet",
+            id=channel_id
+        )
+
+        if not channel_response.get('items'):
+            print(f"LOG: Channel ID {channel_id} nahi mila। Skip kar rahe hain।")
+            return None
+
+        item = channel_response['items'][0]
+        channel_name = item['snippet']['title']
+        uploads_playlist_id = item['contentDetails']['relatedPlaylists']['uploads']
+        first_page = None
+
+    incremental, last_video_id, last_published_at = _video_count_cursor(state, full_refresh)
 
-    conn = get_db_connection()
-    cur = conn.cursor()
+    print(f"LOG: '{channel_name}' ({channel_id}) ki video ginti shuru ({'incremental' if incremental else 'full'})।")
 
+    # 2. Uploads playlist (naye se purane ki taraf) ko traverse karna, aur har page ki durations ko alag se fetch karna
+    duration_futures = []
+    newest = None
+    next_page_token = None
+    reached_counted_videos = False
+    while not reached_counted_videos:
+        if first_page is not None:
+            playlist_response, first_page = first_page, None
+        else:
+            try:
+                playlist_response = yt_manager.execute(
+                    'playlistItems',
+                    playlistId=uploads_playlist_id,
+                    part="contentDetails",
+                    maxResults=50, # Har baar 50 videos
+                    pageToken=next_page_token
+                )
+            except HttpError as e:
+                print(f"LOG: Playlist fetch error for {channel_name}: {e.reason}। Skipping channel।")
+                raise
+
+        video_ids, page_newest, reached_counted_videos = _scan_playlist_page(playlist_response, last_video_id, last_published_at)
+        newest = newest or page_newest
+
+        if video_ids:
+            # 3. Videos ki details (duration) fetch karna - yeh agle playlist page ke saath-saath chalta hai
+            duration_futures.append(duration_executor.submit(_fetch_video_durations, video_ids))
+
+        # Quota ka dhyan ab QuotaScheduler rakhta hai, isliye yahan sleep ki zaroorat nahi
+        next_page_token = playlist_response.get('nextPageToken')
+        if not next_page_token or not playlist_response.get('items'):
+            break
+
+    durations = []
+    for future in duration_futures:
+        try:
+            durations.extend(future.result())
+        except HttpError as e:
+            print(f"LOG: Video details fetch error for {channel_name}: {e.reason}। Skipping channel।")
+            raise
+
+    print(f"  '{channel_name}': {len(durations)} naye videos process hue।")
+    return _video_count_result(state, channel_name, uploads_playlist_id, incremental, durations, newest,
+                               last_video_id, last_published_at)
+
+
+def _parse_api_timestamp(value):
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def _load_video_count_state(conn, channel_ids):
+    """Pichhli run ka cursor aur ginti DB se laata hai: {channel_id: {...}}।"""
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT channel_id, channel_name, uploads_playlist_id, last_video_id, last_video_published_at,
+                   short_videos_count, long_videos_count
+            FROM channels WHERE channel_id = ANY(%s);
+        """, (list(channel_ids),))
+        columns = [column[0] for column in cur.description]
+        state = {row[0]: dict(zip(columns, row)) for row in cur.fetchall()}
+    conn.rollback()
+    return state
+
+
+def _chunks(items, size=API_BATCH_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _prefetch_video_count_pages(channel_ids, states):
+    """
+    Bahut saare chhote channels ke liye round trips bachata hai:
+    1. Jin channels ki uploads playlist pata nahi, unke liye ek-ek ki jagah 50-50 IDs ke channels.list calls।
+    2. Sabhi channels ka pehla playlistItems page batch HTTP requests mein (50 calls ek round trip mein)।
+    `states` mein playlist/naam bhar deta hai (API par na mile to 'missing' = True) aur
+    {channel_id: pehla page} lautata hai। Jo call fail ho, woh channel apne normal raaste se dobara koshish karta hai।
+    """
+    yt_manager = _get_thread_manager()
+    unknown = [channel_id for channel_id in channel_ids if not states[channel_id].get('uploads_playlist_id')]
+    for chunk in _chunks(unknown):
+        try:
+            response = yt_manager.execute('channels', part="contentDetails,snippet", id=",".join(chunk))
+        except HttpError as e:
+            print(f"LOG: {len(chunk)} channels ki details batch mein nahi aa saki ({e.reason})। Ek-ek karke koshish hogi।")
+            continue
+        found = {item['id']: item for item in response.get('items', [])}
+        for channel_id in chunk:
+            item = found.get(channel_id)
+            if item is None:
+                states[channel_id]['missing'] = True
+                continue
+            states[channel_id]['channel_name'] = item['snippet']['title']
+            states[channel_id]['uploads_playlist_id'] = item['contentDetails']['relatedPlaylists']['uploads']
+
+    with_playlist = [channel_id for channel_id in channel_ids if states[channel_id].get('uploads_playlist_id')]
+    first_pages = {}
+    for chunk in _chunks(with_playlist):
+        responses = yt_manager.execute_batch('playlistItems', [
+            dict(playlistId=states[channel_id]['uploads_playlist_id'], part="contentDetails", maxResults=50)
+            for channel_id in chunk
+        ])
+        for channel_id, response in zip(chunk, responses):
+            if not isinstance(response, Exception):
+                first_pages[channel_id] = response
+    return first_pages
+
+
+def _count_small_channels(first_pages, states, full_refresh, duration_executor):
+    """
+    Jin channels ke saare naye videos pehle page mein hi hain, unki durations kai channels ki
+    IDs milakar 50-50 ke videos.list calls se aati hain (har channel ki alag call nahi)।
+    Lautata hai: {channel_id: result}। Jin ki duration call fail ho, woh result mein nahi hote।
+    """
+    small = {}
+    for channel_id, page in first_pages.items():
+        state = states[channel_id]
+        incremental, last_video_id, last_published_at = _video_count_cursor(state, full_refresh)
+        video_ids, newest, reached = _scan_playlist_page(page, last_video_id, last_published_at)
+        if reached or not page.get('nextPageToken') or not page.get('items'):
+            small[channel_id] = (incremental, last_video_id, last_published_at, video_ids, newest)
+
+    all_video_ids = [video_id for *_, video_ids, _ in small.values() for video_id in video_ids]
+    durations, failed_ids = {}, set()
+    futures = {duration_executor.submit(_fetch_video_durations_by_id, chunk): chunk for chunk in _chunks(all_video_ids)}
+    for future in as_completed(futures):
+        try:
+            durations.update(future.result())
+        except HttpError as e:
+            print(f"LOG: {len(futures[future])} videos ki durations batch mein nahi aa saki ({e.reason})।")
+            failed_ids.update(futures[future])
+
+    results = {}
+    for channel_id, (incremental, last_video_id, last_published_at, video_ids, newest) in small.items():
+        if failed_ids.intersection(video_ids):
+            continue
+        state = states[channel_id]
+        channel_name = state.get('channel_name') or channel_id
+        results[channel_id] = _video_count_result(
+            state, channel_name, state['uploads_playlist_id'], incremental,
+            [durations[video_id] for video_id in video_ids if video_id in durations], newest,
+            last_video_id, last_published_at,
+        )
+        print(f"  '{channel_name}': {len(video_ids)} naye videos process hue (batch)।")
+    return results
+
+
+def _completed_future(result=None, exception=None):
+    future = Future()
+    if exception is not None:
+        future.set_exception(exception)
+    else:
+        future.set_result(result)
+    return future
+
+
+def update_video_counts(channel_ids, max_workers=None, full_refresh=False, job_id=None):
+    """
+    Chune hue channels ke Shorts aur Long Videos ki ginti karta hai।
+    Channels `max_workers` threads mein baante jate hain (default: VIDEO_COUNT_WORKERS);
+    max_workers=1 dene par channels ek-ek karke process hote hain।
+    Pehle gine ja chuke channels ke sirf naye uploads padhe jaate hain; full_refresh=True se
+    poori playlist dobara gini jaati hai (jaise videos delete hone ke baad)।
+    Channel lookups, pehle playlist pages aur chhote channels ki durations batch mein aati hain।
+    """
+    max_workers = max(1, max_workers or VIDEO_COUNT_WORKERS)
+    print(f"\n--- Update Video Counts Job Shuru Hua ({len(channel_ids)} channels, {max_workers} workers) ---")
+
+    api_keys = youtube_api_keys()
+    if not api_keys:
+        print("FATAL ERROR: YouTube API keys configure nahi hain ya khali hain.")
+        return
+
+    channel_ids = list(dict.fromkeys(channel_ids))
+    with db.connection() as conn:
+        states = _load_video_count_state(conn, channel_ids)
     for channel_id in channel_ids:
+        states.setdefault(channel_id, {})
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='video-count') as channel_executor, \
+            ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='video-duration') as duration_executor:
+        futures = {}
         try:
-            # 1. Channel details se uploads playlist ID nikalna
-            channel_response = yt_manager.service.channels().list(
-                part="contentDetails,snippet",
-                id=channel_id
-            ).execute()
+            first_pages = _prefetch_video_count_pages(channel_ids, states)
+            small_results = _count_small_channels(first_pages, states, full_refresh, duration_executor)
+        except QuotaExhaustedError as e:
+            # Neeche wala loop ise baaki quota errors ki tarah hi record karta hai
+            futures[_completed_future(exception=e)] = None
+            channel_ids_to_count = []
+        else:
+            channel_ids_to_count = channel_ids
 
-            if not channel_response.get('items'):
+        for channel_id in channel_ids_to_count:
+            if channel_id in small_results:
+                future = _completed_future(small_results[channel_id])
+            elif states[channel_id].get('missing'):
                 print(f"LOG: Channel ID {channel_id} nahi mila। Skip kar rahe hain।")
-                continue
+                future = _completed_future(None)
+            else:
+                future = channel_executor.submit(
+                    _count_channel_videos, channel_id, states[channel_id], duration_executor, full_refresh,
+                    first_pages.get(channel_id)
+                )
+            futures[future] = channel_id
 
-            item = channel_response['items'][0]
-            channel_name = item['snippet']['title']
-            uploads_playlist_id = item['contentDetails']['relatedPlaylists']['uploads']
-
-            print(f"LOG: '{channel_name}' ({channel_id}) ki video ginti shuru।")
-            
-            shorts_count = 0
-            long_videos_count = 0
-            
-            # 2. Uploads playlist ke items ko traverse karna
-            next_page_token = None
-            total_videos_processed = 0
-            
-            while True:
-                try:
-                    playlist_response = yt_manager.service.playlistItems().list(
-                        playlistId=uploads_playlist_id,
-                        part="contentDetails",
-                        maxResults=50, # Har baar 50 videos
-                        pageToken=next_page_token
-                    ).execute()
-                except HttpError as e:
-                    # Agar playlist items fetch karte waqt error aaye, to key switch ya skip
-                    print(f"LOG: Playlist fetch error for {channel_name}: {e.reason}। Skipping channel।")
-                    break
-                
-                video_ids = [item['contentDetails']['videoId'] for item in playlist_response.get('items', [])]
-                if not video_ids:
-                    break # Agar aur videos na hon
-                
-                # 3. Videos ki details (duration) fetch karna
-                video_response = None
+        # 4. Database mein update karna - jaise-jaise channels poore hote hain
+        progress = {'channels_total': len(channel_ids), 'channels_done': 0, 'channels_updated': 0}
+        quota_error = None
+        with db.connection() as conn:
+            cur = conn.cursor()
+            if job_id:
+                job_queue.update_progress(cur, job_id, progress)
+                conn.commit()
+            for future in as_completed(futures):
+                channel_id = futures[future]
+                progress['channels_done'] += 1
                 try:
-                    video_response = yt_manager.service.videos().list(
-                        part="contentDetails",
-                        id=",".join(video_ids)
-                    ).execute()
-                except HttpError as e:
-                    print(f"LOG: Video details fetch error for {channel_name}: {e.reason}। Skipping batch।")
-                    # Agar video details fetch karte waqt error aaye, to agle channel par chale jayenge
-                    break 
-                    
-                for video_item in video_response.get('items', []):
-                    # Duration format: PT#M#S
-                    duration_str = video_item['contentDetails']['duration']
-                    
-                    # 'PT' ko hata dein
-                    duration_str = duration_str[2:] 
-                    
-                    # Seconds mein convert karne ka ek aasaan tarika (Shorts < 60 seconds hote hain)
-                    # Simple check: Agar duration mein 'M' ya 'H' nahi hai aur 'S' ka count 60 se kam hai, toh short.
-                    is_short = ('M' not in duration_str and 'H' not in duration_str and 
-                                (int(re.search(r'(\d+)S', duration_str).group(1)) if re.search(r'(\d+)S', duration_str) else 0) < 60)
-                    
-                    if is_short:
-                        shorts_count += 1
-                    else:
-                        long_videos_count += 1
-
-                total_videos_processed += len(video_ids)
-                print(f"  Processed {total_videos_processed} videos।")
-
-                next_page_token = playlist_response.get('nextPageToken')
-                if not next_page_token:
+                    result = future.result()
+                    if result is None:
+                        VIDEO_COUNT_CHANNELS.inc(outcome='skipped')
+                        if job_id:
+                            job_queue.update_progress(cur, job_id, progress)
+                            conn.commit()
+                        continue
+                    write_started = time.perf_counter()
+                    cur.execute("""
+                        UPDATE channels 
+                        SET short_videos_count = %(short_videos_count)s, long_videos_count = %(long_videos_count)s,
+                            uploads_playlist_id = %(uploads_playlist_id)s, last_video_id = %(last_video_id)s,
+                            last_video_published_at = %(last_video_published_at)s, retrieved_at = CURRENT_TIMESTAMP
+                        WHERE channel_id = %(channel_id)s;
+                    """, dict(result, channel_id=channel_id))
+                    progress['channels_updated'] += 1
+                    if job_id:
+                        job_queue.update_progress(cur, job_id, progress)
+                    conn.commit()
+                    DB_WRITE_SECONDS.observe(time.perf_counter() - write_started, operation='video_counts_update')
+                    VIDEO_COUNT_CHANNELS.inc(outcome='updated')
+                    print(f"SUCCESS: '{result['channel_name']}' updated। Shorts: {result['short_videos_count']}, Long: {result['long_videos_count']}")
+
+                except QuotaExhaustedError as e:
+                    print(f"FATAL ERROR: {e} Baaki channels skip kar rahe hain।")
+                    quota_error = e
+                    conn.rollback()
+                    _record_quota_status(conn, f"All API keys have used up today's quota. Video counts stopped early. ({e})")
+                    for pending in futures:
+                        pending.cancel()
                     break
-                time.sleep(0.5) # API Quota ka dhyan rakhte hue thoda wait
-
-            # 4. Database mein update karna
-            cur.execute("""
-                UPDATE channels 
-                SET short_videos_count = %s, long_videos_count = %s, retrieved_at = CURRENT_TIMESTAMP
-                WHERE channel_id = %s;
-            """, (shorts_count, long_videos_count, channel_id))
-            conn.commit()
-            print(f"SUCCESS: '{channel_name}' updated। Shorts: {shorts_count}, Long: {long_videos_count}")
+                except Exception as e:
+                    print(f"ERROR: Channel {channel_id} update karte samay anjaan error: {e}")
+                    VIDEO_COUNT_CHANNELS.inc(outcome='failed')
+                    conn.rollback()
+                    if job_id:
+                        job_queue.update_progress(cur, job_id, progress)
+                        conn.commit()
 
-        except Exception as e:
-            print(f"ERROR: Channel {channel_id} update karte samay anjaan error: {e}")
-            conn.rollback()
-            
-    cur.close()
-    conn.close()
+            cur.close()
+            if progress['channels_updated']:
+                channel_stats.refresh_after_job(conn, channel_ids=channel_ids)
+    get_scheduler(api_keys).flush()
+    if quota_error is not None and job_id:
+        # Resume par poore channels dobara chalte hain; stored playlist cursor se yeh incremental hi rehta hai
+        raise job_queue.JobPaused(f"Quota khatam: {quota_error}", resume_after=next_quota_reset())
     print("\n--- Update Video Counts Job Poora Hua ---\n")
 # --- Update Video Counts function end ---
 
 
-def find_channels(category, date_after, min_subs, max_subs, max_channels_limit, require_contact):
-    print("\n--- Naya Channel Search Job Shuru Hua ---")
-    print(f"Parameters: Category='{category}', After='{date_after}', Subs='{min_subs}-{max_subs}', Limit='{max_channels_limit}'")
+# (channel_id, ...) - refresh_channel_metadata isi kram mein compare aur update karta hai
+_METADATA_COLUMNS = (
+    'channel_name', 'subscriber_count', 'description_hash', 'emails', 'phone_numbers',
+    'instagram_link', 'twitter_link', 'linkedin_link',
+)
+# /results ke retrieved_at sort wala expression, taaki wahi (expr, channel_id) index kaam aaye
+_RETRIEVED_AT_KEY = channel_queries.SORT_EXPRESSIONS['retrieved_at']
 
-    try:
-        yt_manager = YouTubeServiceManager(YOUTUBE_API_KEYS)
-    except ValueError as e:
-        print(f"FATAL ERROR: {e}")
+
+def _load_metadata_page(cur, cursor, limit):
+    """
+    Refresh ke liye agle `limit` channels, (retrieved_at, channel_id) keyset order mein (sort index se)।
+    Sirf woh rows jo is lap ke shuru hone se pehle ki hain, taaki badli hui rows isi lap mein dobara na aayein।
+    """
+    sql = f"""
+        SELECT channel_id, {', '.join(_METADATA_COLUMNS)}, {_RETRIEVED_AT_KEY}::text
+        FROM channels
+        WHERE {_RETRIEVED_AT_KEY} < %(lap_started_at)s::timestamptz
+    """
+    if cursor.get('channel_id'):
+        sql += f" AND ({_RETRIEVED_AT_KEY}, channel_id) > (%(retrieved_at)s::timestamptz, %(channel_id)s)"
+    sql += f" ORDER BY {_RETRIEVED_AT_KEY}, channel_id LIMIT %(limit)s"
+    cur.execute(sql, dict(cursor, limit=limit))
+    return cur.fetchall()
+
+
+def _save_metadata_cursor(cur, cursor):
+    if cursor is None:
+        cur.execute("DELETE FROM app_state WHERE key = %s", (METADATA_REFRESH_CURSOR_KEY,))
         return
+    cur.execute("""
+        INSERT INTO app_state (key, value) VALUES (%s, %s)
+        ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value;
+    """, (METADATA_REFRESH_CURSOR_KEY, json.dumps(cursor)))
 
-    keywords = CATEGORY_KEYWORDS.get(category, "").split(',')
-    search_after_date = datetime.strptime(date_after, '%Y-%m-%d').strftime('%Y-%m-%dT%H:%M:%SZ')
-    conn = get_db_connection()
-    cur = conn.cursor()
 
-    try:
-        cur.execute("DELETE FROM app_state WHERE key = 'quota_status'")
-        conn.commit()
-    except Exception:
+def _changed_metadata(rows, fetched):
+    """
+    DB rows aur API items ko milata hai। Description ka hash na badla ho to contacts dobara nahi nikale jaate।
+    Lautata hai: (badli hui rows ke update tuples, outcome counts)।
+    """
+    outcomes = {'unchanged': 0, 'changed': 0, 'missing': 0}
+    candidates = []
+    for row in rows:
+        channel_id, current = row[0], dict(zip(_METADATA_COLUMNS, row[1:-1]))
+        item = fetched.get(channel_id)
+        if item is None:
+            # Channel hata diya gaya ya API se nahi aaya; row jaisi hai waisi rehti hai
+            outcomes['missing'] += 1
+            continue
+        snippet, stats = item.get('snippet', {}), item.get('statistics', {})
+        updated = dict(current, channel_name=snippet.get('title') or current['channel_name'])
+        if not stats.get('hiddenSubscriberCount', False) and 'subscriberCount' in stats:
+            updated['subscriber_count'] = int(stats['subscriberCount'])
+        description = snippet.get('description', '')
+        updated['description_hash'] = description_hash(description)
+        candidates.append((channel_id, current, updated, description))
+
+    to_extract = [entry for entry in candidates if entry[2]['description_hash'] != (entry[1]['description_hash'] or '').strip()]
+    for (_, _, updated, _), details in zip(to_extract, extract_details_bulk(entry[3] for entry in to_extract)):
+        updated.update(
+            emails=details['emails'], phone_numbers=details['phones'], instagram_link=details['instagram_link'],
+            twitter_link=details['twitter_link'], linkedin_link=details['linkedin_link'],
+        )
+    description_changed = {entry[0] for entry in to_extract}
+
+    changes = []
+    for channel_id, current, updated, description in candidates:
+        if updated == current:
+            outcomes['unchanged'] += 1
+            continue
+        outcomes['changed'] += 1
+        changes.append((channel_id, description if channel_id in description_changed else None)
+                       + tuple(updated[column] for column in _METADATA_COLUMNS))
+    return changes, outcomes
+
+
+def refresh_channel_metadata(max_channels=None, job_id=None):
+    """
+    Pehle se save channels ka naam, subscribers, description se nikle contacts aur social links
+    taaza karta hai। Sabse purane `retrieved_at` wale channels pehle, 50-50 IDs ke channels.list
+    calls (1 unit per 50 channels) batch HTTP requests mein। Sirf badli hui rows ek bulk UPDATE se
+    likhi jaati hain (unka retrieved_at bhi badalta hai); baaki rows ko chhua nahi jata।
+    Table par position (cursor) app_state mein rehta hai, isliye agla job wahin se aage badhta hai
+    aur poori table ek "lap" mein ghoom kar phir shuru se chalti hai।
+    """
+    max_channels = max_channels or METADATA_REFRESH_MAX_CHANNELS
+    print(f"\n--- Metadata Refresh Job Shuru Hua (max {max_channels} channels) ---")
+    api_keys = youtube_api_keys()
+    if not api_keys:
+        print("FATAL ERROR: YouTube API keys configure nahi hain ya khali hain.")
+        return
+
+    yt_manager = _get_thread_manager()
+    progress = {'channels_checked': 0, 'channels_changed': 0, 'channels_missing': 0}
+    changed_ids = []
+    quota_error = None
+    with db.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT value FROM app_state WHERE key = %s", (METADATA_REFRESH_CURSOR_KEY,))
+            row = cur.fetchone()
+            cursor = json.loads(row[0]) if row else None
+            if cursor is None:
+                cur.execute("SELECT CURRENT_TIMESTAMP::text")
+                cursor = {'lap_started_at': cur.fetchone()[0]}
         conn.rollback()
 
-    new_channels_found = 0
-    processed_channel_ids = set()
-    cur.execute("SELECT channel_id FROM channels")
-    processed_channel_ids.update(row[0] for row in cur.fetchall())
-    print(f"LOG: Database mein pehle se {len(processed_channel_ids)} channels hain।")
-    
-    for keyword in keywords:
-        keyword = keyword.strip()
-        if not keyword or new_channels_found >= max_channels_limit:
-            break
-        
-        print(f"\nLOG: Keyword '{keyword}' ke liye search shuru।")
-        next_page_token = None
-        
-        while new_channels_found < max_channels_limit:
-            search_response = None
-            for i in range(len(yt_manager.api_keys) + 1):
-                try:
-                    youtube = yt_manager.service
-                    print(f"LOG: Page fetch karne ki koshish... (Key index: {yt_manager.current_key_index})")
-                    search_response = youtube.search().list(
-                        q=keyword, part="snippet", type="channel", maxResults=50,
-                        publishedAfter=search_after_date, pageToken=next_page_token
-                    ).execute()
-                    break # Agar safal, to is loop se bahar
-                except HttpError as e:
-                    print(f"LOG: API Error! Status: {e.resp.status}, Reason: {e.reason}")
-                    if e.resp.status in [403, 400]: # Forbidden, Quota, Invalid Key, etc.
-                        if i < len(yt_manager.api_keys) - 1:
-                            yt_manager.switch_key_and_get_service()
-                            continue
-                        else:
-                            print("FATAL ERROR: Sabhi API keys fail ho gayi hain। Worker ruk raha hai।")
-                            error_message = f"All API keys are failing। Please check keys in Google Cloud Console। Last error: {e.reason}"
-                            cur.execute("INSERT INTO app_state (key, value) VALUES ('quota_status', %s) ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value;", (error_message,))
-                            conn.commit()
-                            conn.close()
-                            return
-                    else:
-                        print(f"LOG: Anjaan HttpError, is keyword ko skip kar rahe hain: {e}")
-                        break # Is anjaan error par is keyword ko chhod do
-            
-            if not search_response:
-                print(f"LOG: Keyword '{keyword}' ke liye data fetch nahi ho saka। Agle keyword par ja rahe hain।")
+        while progress['channels_checked'] < max_channels:
+            page_size = min(METADATA_REFRESH_PAGE_SIZE, max_channels - progress['channels_checked'])
+            with conn.cursor() as cur:
+                rows = _load_metadata_page(cur, cursor, page_size)
+            conn.rollback()
+            lap_finished = len(rows) < page_size
+            if not rows:
+                with conn.cursor() as cur:
+                    _save_metadata_cursor(cur, None)
+                conn.commit()
                 break
 
-            channel_items = search_response.get('items', [])
-            if not channel_items:
-                print(f"LOG: Keyword '{keyword}' ke liye is page par aur channels nahi mile।")
+            channel_ids = [row[0] for row in rows]
+            try:
+                responses = yt_manager.execute_batch('channels', [
+                    dict(part="snippet,statistics", id=",".join(chunk), fields=METADATA_FIELDS)
+                    for chunk in _chunks(channel_ids)
+                ])
+            except QuotaExhaustedError as e:
+                quota_error = e
                 break
-            
-            channel_ids = [item['snippet']['channelId'] for item in channel_items if item['snippet']['channelId'] not in processed_channel_ids]
-            if not channel_ids:
-                print("LOG: Is page par naye (unique) channels nahi mile।")
-                next_page_token = search_response.get('nextPageToken')
-                if not next_page_token: break
-                continue
+            fetched, failed = {}, set()
+            for chunk, response in zip(_chunks(channel_ids), responses):
+                if isinstance(response, Exception):
+                    print(f"LOG: {len(chunk)} channels ki metadata nahi aa saki ({response})। Agli lap mein dobara koshish hogi।")
+                    failed.update(chunk)
+                    continue
+                fetched.update((item['id'], item) for item in response.get('items', []))
+
+            changes, outcomes = _changed_metadata([row for row in rows if row[0] not in failed], fetched)
+            last = rows[-1]
+            cursor = dict(cursor, retrieved_at=last[-1], channel_id=last[0])
+            progress['channels_checked'] += len(rows)
+            progress['channels_changed'] += outcomes['changed']
+            progress['channels_missing'] += outcomes['missing']
+
+            write_started = time.perf_counter()
+            with conn.cursor() as cur:
+                if changes:
+                    execute_values(cur, f"""
+                        UPDATE channels AS c
+                        SET description = COALESCE(v.description, c.description),
+                            {', '.join(f"{column} = v.{column}" for column in _METADATA_COLUMNS)},
+                            retrieved_at = CURRENT_TIMESTAMP
+                        FROM (VALUES %s) AS v (channel_id, description, {', '.join(_METADATA_COLUMNS)})
+                        WHERE c.channel_id = v.channel_id;
+                    """, changes, template="(%s, %s::text, %s, %s::bigint, %s, %s, %s, %s, %s, %s)", page_size=len(changes))
+                # Page ke updates aur cursor ek hi commit mein, taaki job beech mein ruke to bhi kuch chhoote nahi
+                _save_metadata_cursor(cur, None if lap_finished else cursor)
+                if job_id:
+                    job_queue.update_progress(cur, job_id, progress)
+            conn.commit()
+            DB_WRITE_SECONDS.observe(time.perf_counter() - write_started, operation='metadata_update')
+            changed_ids.extend(change[0] for change in changes)
+            for outcome, count in outcomes.items():
+                METADATA_REFRESH_CHANNELS.inc(count, outcome=outcome)
+            METADATA_REFRESH_CHANNELS.inc(len(failed), outcome='failed')
+            print(f"LOG: {progress['channels_checked']} channels check hue, {progress['channels_changed']} badle।")
+            if lap_finished:
+                print("LOG: Saare channels is lap mein refresh ho gaye। Agla job phir sabse purane se shuru karega।")
+                break
+
+        if changed_ids:
+            # Subscriber counts aur contacts badle hain, isliye un categories ki summary bhi
+            channel_stats.refresh_after_job(conn, channel_ids=changed_ids)
+        if quota_error is not None:
+            print(f"FATAL ERROR: {quota_error} Metadata refresh ruk raha hai।")
+            _record_quota_status(conn, f"All API keys have used up today's quota. Metadata refresh stopped early. ({quota_error})")
+
+    get_scheduler(api_keys).flush()
+    if quota_error is not None and job_id:
+        raise job_queue.JobPaused(f"Quota khatam: {quota_error}", resume_after=next_quota_reset())
+    print(f"\n--- Metadata Refresh Job Poora Hua ({progress['channels_checked']} checked, {progress['channels_changed']} changed) ---\n")
+
+
+_STAGE_END = object()
+
+
+class _StageError:
+    def __init__(self, error):
+        self.error = error
+
+
+def _prefetched(iterable, maxsize, stop):
+    """
+    `iterable` ko ek background thread mein chalata hai jo consumer se `maxsize` items aage tak
+    bounded queue mein rakhta hai, taaki agla stage (jaise agla search page) pichhle ke saath overlap ho।
+    Producer ka exception consumer ki taraf dobara raise hota hai। maxsize=0 par seedha iterate karta hai।
+    """
+    if maxsize <= 0:
+        yield from iterable
+        return
+    items = queue.Queue(maxsize=maxsize)
+    done = threading.Event()
 
-            processed_channel_ids.update(channel_ids)
-            print(f"LOG: {len(channel_ids)} naye channel IDs ke details fetch kiye ja rahe hain।")
-            
+    def _put(item):
+        while not done.is_set():
             try:
-                channel_details_response = yt_manager.service.channels().list(part="snippet,statistics", id=",".join(channel_ids)).execute()
-            except HttpError as e:
-                print(f"LOG: Channel details fetch karte samay error ({e.reason})। Is batch ko skip kar rahe hain।")
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
                 continue
+        return False
 
-            for item in channel_details_response.get('items', []):
-                if new_channels_found >= max_channels_limit: break
-                
-                channel_id = item['id']
-                channel_name = item['snippet'].get('title', 'N/A')
-                
-                description = item.get('snippet', {}).get('description', '')
-                details = extract_details(description) #
-                if require_contact and not (details['emails'] or details['phones']):
-                    print(f"LOG: Skip - '{channel_name}' ke paas contact info nahi hai।")
-                    continue
+    def _produce():
+        try:
+            for item in iterable:
+                if stop.is_set() or not _put(item):
+                    break
+        except BaseException as e:
+            _put(_StageError(e))
+            return
+        _put(_STAGE_END)
 
-                stats = item.get('statistics', {})
-                if stats.get('hiddenSubscriberCount', False):
-                    print(f"LOG: Skip - '{channel_name}' ke subscribers hidden hain।")
-                    continue
-                
-                subscriber_count = int(stats.get('subscriberCount', 0))
-                if not (min_subs <= subscriber_count <= max_subs):
-                    print(f"LOG: Skip - '{channel_name}' subscriber range ({subscriber_count}) mein nahi hai।")
-                    continue
-                
-                print(f"LOG: Channel process ho raha hai: '{channel_name}'")
-                channel_info = {
-                    "channel_id": channel_id, "channel_name": channel_name, "subscriber_count": subscriber_count,
-                    "creation_date": item['snippet'].get('publishedAt', '')[:10], "emails": details['emails'],
-                    "phone_numbers": details['phones'], "description": description, "category": category
-                }
-                cur.execute("""
-                    INSERT INTO channels (channel_id, channel_name, subscriber_count, creation_date, emails, phone_numbers, description, category)
-                    VALUES (%(channel_id)s, %(channel_name)s, %(subscriber_count)s, %(creation_date)s, %(emails)s, %(phone_numbers)s, %(description)s, %(category)s)
-                    ON CONFLICT (channel_id) DO NOTHING;
-                """, channel_info)
-
-                if cur.rowcount > 0:
-                    new_channels_found += 1
-                    conn.commit()
-                    print(f"SUCCESS: Naya channel save hua: '{channel_name}' ({new_channels_found}/{max_channels_limit})")
+    threading.Thread(target=_produce, name=f"{threading.current_thread().name}-prefetch", daemon=True).start()
+    try:
+        while True:
+            item = items.get()
+            if item is _STAGE_END:
+                return
+            if isinstance(item, _StageError):
+                raise item.error
+            yield item
+    finally:
+        done.set()
 
-            next_page_token = search_response.get('nextPageToken')
-            if not next_page_token:
-                print(f"LOG: Keyword '{keyword}' ke liye sabhi pages poore hue।")
-                break
-            time.sleep(1)
-            
-    cur.close()
-    conn.close()
-    print("\n--- Channel Search Job Poora Hua ---\n")
+
+def _search_pages(keyword, published_after, page_token, stop):
+    """Stage 1: keyword ke search pages, (response, agle page ka token) ke roop mein।"""
+    yt = _get_thread_manager()
+    while not stop.is_set():
+        # Key chunna, quota ka wait aur quota error par key switch execute() ke andar hota hai
+        response = yt.execute(
+            'search', cache_ttl=api_cache.SEARCH_CACHE_TTL,
+            q=keyword, part="snippet", type="channel", maxResults=50, fields=SEARCH_FIELDS,
+            publishedAfter=published_after, pageToken=page_token
+        )
+        page_token = response.get('nextPageToken') if response.get('items') else None
+        yield response, page_token
+        if not page_token:
+            return
+
+
+def _fetch_channel_details(yt, channel_ids):
+    """Stage 3a: naye channel IDs ke statistics aur snippet, sirf zaroori fields ke saath (ek call, 1 unit)।"""
+    try:
+        response = yt.execute(
+            'channels', cache_ttl=api_cache.CHANNELS_CACHE_TTL,
+            part="snippet,statistics", id=",".join(channel_ids), fields=CHANNEL_DETAIL_FIELDS
+        )
+    except HttpError as e:
+        print(f"LOG: Channel details fetch karte samay error ({e.reason})। Is batch ko skip kar rahe hain।")
+        return []
+    return response.get('items', [])
+
+
+def _filter_by_statistics(items, min_subs, max_subs):
+    """
+    Stage 3b: sabse saste filter - hidden subscribers aur subscriber range - description ko chhue
+    bina। Lautata hai [(item, subscriber_count)]।
+    """
+    kept, hidden, out_of_range = [], 0, 0
+    for item in items:
+        stats = item.get('statistics', {})
+        if stats.get('hiddenSubscriberCount', False):
+            hidden += 1
+            continue
+        subscriber_count = int(stats.get('subscriberCount', 0))
+        if not (min_subs <= subscriber_count <= max_subs):
+            out_of_range += 1
+            continue
+        kept.append((item, subscriber_count))
+    CRAWLER_CHANNELS.inc(hidden, outcome='hidden_subscribers')
+    CRAWLER_CHANNELS.inc(out_of_range, outcome='out_of_range')
+    if hidden or out_of_range:
+        print(f"LOG: Skip - {hidden} channels ke subscribers hidden, {out_of_range} subscriber range ({min_subs}-{max_subs}) se bahar।")
+    return kept
+
+
+def _extract_channel_rows(candidates, require_contact, category):
+    """Stage 4: filter se bache channels ki descriptions se contacts nikal kar insert rows banata hai।"""
+    # Poore page ki descriptions ek saath process hoti hain
+    page_details = extract_details_bulk(item.get('snippet', {}).get('description', '') for item, _ in candidates)
+    rows = []
+    for (item, subscriber_count), details in zip(candidates, page_details):
+        snippet = item.get('snippet', {})
+        channel_name = snippet.get('title', 'N/A')
+        if require_contact and not (details['emails'] or details['phones']):
+            print(f"LOG: Skip - '{channel_name}' ke paas contact info nahi hai।")
+            CRAWLER_CHANNELS.inc(outcome='no_contact')
+            continue
+        description = snippet.get('description', '')
+        rows.append((
+            item['id'], channel_name, subscriber_count, snippet.get('publishedAt', '')[:10] or None,
+            details['emails'], details['phones'], description, category,
+            details['instagram_link'], details['twitter_link'], details['linkedin_link'], description_hash(description)
+        ))
+    return rows
+
+
+class _SweepState:
+    """find_channels ke sabhi keyword workers ke beech shared: seen-ID index, limit counter aur stop signal।"""
+    def __init__(self, seen_index, limit, found=0):
+        self.lock = threading.Lock()
+        self.seen_index = seen_index
+        self.limit = limit
+        self.found = found
+        self.reserved = 0
+        self.pages = 0
+        self.keywords_done = 0
+        self.stop = threading.Event()
+        self.quota_error = None
+        if found >= limit:
+            self.stop.set()
+
+    def reserve(self, wanted):
+        """Limit mein jitni jagah bachi hai, usmein se `wanted` tak slots reserve karta hai।"""
+        with self.lock:
+            slots = max(0, min(wanted, self.limit - self.found - self.reserved))
+            self.reserved += slots
+        return slots
+
+    def settle(self, reserved, inserted):
+        """Reserve kiye slots chhod kar asal mein save hue channels jodta hai; limit poori ho to sabko rokta hai।"""
+        with self.lock:
+            self.reserved -= reserved
+            self.found += inserted
+            found = self.found
+        if found >= self.limit:
+            self.stop.set()
+        return found
+
+    def record_page(self, keyword_finished=False):
+        with self.lock:
+            self.pages += 1
+            if keyword_finished:
+                self.keywords_done += 1
+
+    def progress(self):
+        """jobs.progress ke liye counters ka ek consistent snapshot।"""
+        with self.lock:
+            return {'keywords_done': self.keywords_done, 'pages_fetched': self.pages, 'channels_saved': self.found}
+
+
+def _keyword_checkpoints(checkpoint):
+    """Checkpoint se har keyword ki state ({page_token, done, found, pages}) nikalta hai।"""
+    return {int(index): state for index, state in checkpoint.get('keywords', {}).items()}
+
+
+def find_channels(category, date_after, min_subs, max_subs, max_channels_limit, require_contact, job_id=None, max_workers=None):
+    """
+    Category ke keywords `max_workers` threads mein baante jate hain (default: SEARCH_KEYWORD_WORKERS)।
+    Sabhi threads ek hi dedup set aur ek hi limit counter share karte hain, aur limit poori hote hi sab ruk jate hain।
+    """
+    max_workers = max(1, max_workers or SEARCH_KEYWORD_WORKERS)
+    print("\n--- Naya Channel Search Job Shuru Hua ---")
+    print(f"Parameters: Category='{category}', After='{date_after}', Subs='{min_subs}-{max_subs}', Limit='{max_channels_limit}', Workers='{max_workers}'")
+
+    api_keys = youtube_api_keys()
+    if not api_keys:
+        print("FATAL ERROR: Koi bhi YouTube API key nahi mili। Kripya .env file check karein।")
+        return
+    scheduler = get_scheduler(api_keys)
+
+    keywords = [keyword.strip() for keyword in CATEGORY_KEYWORDS.get(category, "").split(',')]
+    search_after_date = datetime.strptime(date_after, '%Y-%m-%d').strftime('%Y-%m-%dT%H:%M:%SZ')
+    with db.connection() as conn:
+        cur = conn.cursor()
+
+        try:
+            cur.execute("DELETE FROM app_state WHERE key = 'quota_status'")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+
+        # Job dobara chale (quota pause, crash, resume) to har keyword wahi se shuru hota hai jahan ruka tha
+        checkpoint = job_queue.load_checkpoint(conn, job_id) if job_id else {}
+        keyword_states = _keyword_checkpoints(checkpoint)
+        already_found = sum(state.get('found', 0) for state in keyword_states.values())
+        if keyword_states:
+            print(f"LOG: Job #{job_id} checkpoint se shuru: {already_found} channels pehle mil chuke।")
+
+        sweep = _SweepState(make_seen_index(), max_channels_limit, found=already_found)
+        sweep.keywords_done = sum(1 for state in keyword_states.values() if state.get('done'))
+        sweep.pages = sum(state.get('pages', 0) for state in keyword_states.values())
+        if job_id:
+            job_queue.update_progress(cur, job_id, dict(sweep.progress(), keywords_total=sum(1 for keyword in keywords if keyword),
+                                                        channels_limit=max_channels_limit))
+            conn.commit()
+        cur.close()
+
+        def _sweep_keyword(keyword_index, keyword):
+            """Ek keyword ke saare pages (worker thread mein)। Har page ka data aur checkpoint ek commit mein।"""
+            state = dict(keyword_states.get(keyword_index, {}))
+            state.setdefault('found', 0)
+            state.setdefault('pages', 0)
+            yt = _get_thread_manager()
+            print(f"\nLOG: Keyword '{keyword}' ke liye search shuru।")
+
+            # Pipeline: search pages (prefetch thread) -> dedup -> statistics filter -> snippet/contacts -> batched write.
+            # Saste filter pehle chalte hain, isliye contact extraction sirf range mein aaye channels ki descriptions par hoti hai।
+            pages = _prefetched(
+                _search_pages(keyword, search_after_date, state.get('page_token'), sweep.stop),
+                SEARCH_PREFETCH_PAGES, sweep.stop
+            )
+            try:
+                while not sweep.stop.is_set():
+                    try:
+                        search_response, next_page_token = next(pages, (None, None))
+                        if search_response is None:
+                            return
+                        state['pages'] += 1
+                        CRAWLER_PAGES.inc(category=category)
+                        channel_items = search_response.get('items', [])
+                        if not channel_items:
+                            print(f"LOG: Keyword '{keyword}' ke liye is page par aur channels nahi mile।")
+
+                        channel_ids = sweep.seen_index.claim_new(item['snippet']['channelId'] for item in channel_items)
+                        CRAWLER_CHANNELS.inc(len(channel_items) - len(channel_ids), outcome='duplicate')
+                        rows_to_insert = []
+                        if channel_items and not channel_ids:
+                            print(f"LOG: Keyword '{keyword}' ke is page par naye (unique) channels nahi mile।")
+                        elif channel_ids:
+                            print(f"LOG: {len(channel_ids)} naye channel IDs filter kiye ja rahe hain ('{keyword}')।")
+                            candidates = _filter_by_statistics(_fetch_channel_details(yt, channel_ids), min_subs, max_subs)
+                            if candidates:
+                                rows_to_insert = _extract_channel_rows(candidates, require_contact, category)
+                    except QuotaExhaustedError as e:
+                        sweep.quota_error = e
+                        sweep.stop.set()
+                        return
+                    except HttpError as e:
+                        print(f"LOG: Anjaan HttpError, keyword '{keyword}' ko skip kar rahe hain: {e}")
+                        sweep.record_page(keyword_finished=True)
+                        return
+
+                    sweep.record_page(keyword_finished=not next_page_token)
+                    # Limit mein jitni jagah bachi hai utne hi channels save hote hain (baaki workers ke saath shared)
+                    slots = sweep.reserve(len(rows_to_insert))
+                    CRAWLER_CHANNELS.inc(len(rows_to_insert) - slots, outcome='over_limit')
+                    rows_to_insert = rows_to_insert[:slots]
+
+                    # Page ke channels aur is keyword ka checkpoint ek hi transaction (ek commit) mein save hote hain,
+                    # isliye resume par na koi page dobara ginta hai na chhoot-ta hai
+                    inserted = []
+                    write_started = time.perf_counter()
+                    try:
+                        with db.connection() as write_conn:
+                            with write_conn.cursor() as write_cur:
+                                if rows_to_insert:
+                                    inserted = execute_values(write_cur, """
+                                        INSERT INTO channels (channel_id, channel_name, subscriber_count, creation_date, emails, phone_numbers,
+                                                              description, category, instagram_link, twitter_link, linkedin_link, description_hash)
+                                        VALUES %s
+                                        ON CONFLICT (channel_id) DO NOTHING
+                                        RETURNING channel_id, channel_name;
+                                    """, rows_to_insert, page_size=len(rows_to_insert), fetch=True)
+                                if job_id:
+                                    job_queue.save_checkpoint_entry(write_cur, job_id, 'keywords', str(keyword_index), {
+                                        'page_token': next_page_token, 'done': not next_page_token,
+                                        'found': state['found'] + len(inserted), 'pages': state['pages'],
+                                    })
+                                    progress = sweep.progress()
+                                    progress['channels_saved'] += len(inserted)
+                                    job_queue.update_progress(write_cur, job_id, progress)
+                            write_conn.commit()
+                        DB_WRITE_SECONDS.observe(time.perf_counter() - write_started, operation='channels_insert')
+                    except Exception as e:
+                        # Checkpoint aage nahi badha, isliye job yahin rokte hain: retry/resume par yahi page dobara aayega।
+                        # Aage badhte to agla page checkpoint ko is page ke aage le jaata aur iske channels chhoot jaate।
+                        print(f"ERROR: Channels save karte samay DB error: {e}। Keyword '{keyword}' yahin rok rahe hain।")
+                        metrics.log_event('channels_insert_failed', logging.ERROR, keyword=keyword, rows=len(rows_to_insert), error=str(e))
+                        sweep.settle(slots, 0)
+                        CRAWLER_CHANNELS.inc(len(rows_to_insert), outcome='not_saved')
+                        raise
+                    state['found'] += len(inserted)
+                    found = sweep.settle(slots, len(inserted))
+                    CRAWLER_CHANNELS.inc(len(inserted), outcome='saved')
+                    CRAWLER_CHANNELS.inc(len(rows_to_insert) - len(inserted), outcome='not_saved')
+                    metrics.log_event('search_page_done', logging.DEBUG, keyword=keyword, page=state['pages'],
+                                      new_ids=len(channel_ids), saved=len(inserted), found=found)
+
+                    for _, channel_name in inserted:
+                        print(f"SUCCESS: Naya channel save hua: '{channel_name}' ('{keyword}', {found}/{max_channels_limit})")
+
+                    if not next_page_token:
+                        print(f"LOG: Keyword '{keyword}' ke liye sabhi pages poore hue।")
+                        return
+            finally:
+                # Prefetch thread ko rokta hai (limit, quota ya error par bacha hua page chhod diya jata hai)
+                pages.close()
+
+        pending = [
+            (index, keyword) for index, keyword in enumerate(keywords)
+            if keyword and not keyword_states.get(index, {}).get('done')
+        ]
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='keyword-search') as executor:
+            futures = [executor.submit(_sweep_keyword, index, keyword) for index, keyword in pending]
+            try:
+                for future in as_completed(futures):
+                    future.result()
+            except Exception:
+                # Ek worker fail hua to baaki bhi apna current page poora karke ruk jate hain
+                sweep.stop.set()
+                raise
+
+        if job_id:
+            with conn.cursor() as cur:
+                job_queue.update_progress(cur, job_id, sweep.progress())
+            conn.commit()
+        # Job ruk bhi raha ho to ab tak save hue channels summary mein aa jayein
+        channel_stats.refresh_after_job(conn, categories=[category])
+
+        if sweep.quota_error is not None:
+            print("FATAL ERROR: Sabhi API keys fail ho gayi hain। Worker ruk raha hai।")
+            _record_quota_status(conn, f"All API keys are failing। Please check keys in Google Cloud Console। Last error: {sweep.quota_error}")
+            scheduler.flush()
+            if job_id:
+                # Har keyword ka checkpoint pichhle page tak save hai; quota reset hone par job wahin se chalega
+                raise job_queue.JobPaused(f"Quota khatam: {sweep.quota_error}", resume_after=next_quota_reset())
+            return
+
+    scheduler.flush()
+    print(f"\n--- Channel Search Job Poora Hua ({sweep.found}/{max_channels_limit} channels) ---\n")
@@ -0,0 +1,104 @@
+"""
+Contact extraction ka micro-benchmark: purana (5 alag regex scans) vs naya compiled engine।
+
+Usage:
+    python benchmarks/bench_contact_extraction.py                # synthetic corpus
+    python benchmarks/bench_contact_extraction.py --from-db      # channels table ki descriptions (DATABASE_URL)
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.contact_extractor import extract_details, extract_details_bulk
+
+
+def legacy_extract_details(description):
+    """Purana implementation, sirf tulna ke liye।"""
+    emails = list(set(re.findall(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', description)))
+    phones = list(set(re.findall(r'(?:\+91)?[ -]?(?:[6-9]\d{2}[ -]?\d{3}[ -]?\d{4}|\d{10})', description)))
+    instagram = re.search(r'(?:instagram\.com\/|ig:)([a-zA-Z0-9._]+)', description, re.IGNORECASE)
+    twitter = re.search(r'(?:twitter\.com\/|x\.com\/|@)([a-zA-Z0-9_]+)', description, re.IGNORECASE)
+    linkedin = re.search(r'(?:linkedin\.com\/in\/)([a-zA-Z0-9-]+)', description, re.IGNORECASE)
+    return {
+        "emails": ", ".join(emails),
+        "phones": ", ".join(phones),
+        "instagram_link": f"https://www.instagram.com/{instagram.group(1)}" if instagram else None,
+        "twitter_link": f"https://twitter.com/{twitter.group(1)}" if twitter else None,
+        "linkedin_link": f"https://www.linkedin.com/in/{linkedin.group(1)}" if linkedin else None,
+    }
+
+
+FILLER = (
+    "Welcome to my channel! Yahan aapko milenge tech reviews, unboxing aur tips & tricks. "
+    "Subscribe karein aur bell icon dabayein. New video har Monday aur Thursday. "
+    "Gear I use: camera, mic, lights - links niche diye gaye hain. #tech #hindi #review "
+)
+CONTACT_SNIPPETS = [
+    "For business enquiries: {name}@gmail.com",
+    "Collab: {name}.official@outlook.in",
+    "Call/WhatsApp: +91 98{n:08d}",
+    "Phone: 9{n:09d}",
+    "Instagram: https://instagram.com/{name}",
+    "Follow on twitter.com/{name}",
+    "Twitter @{name}",
+    "LinkedIn: https://www.linkedin.com/in/{name}-creator",
+]
+
+
+def synthetic_corpus(size, seed=42):
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(size):
+        parts = [FILLER * rng.randint(1, 4)]
+        for snippet in rng.sample(CONTACT_SNIPPETS, rng.randint(0, 4)):
+            parts.append(snippet.format(name=f"creator{i}", n=rng.randint(0, 99999999)))
+        rng.shuffle(parts)
+        corpus.append("\n".join(parts))
+    return corpus
+
+
+def db_corpus(limit):
+    import psycopg2
+    conn = psycopg2.connect(os.getenv('DATABASE_URL'))
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT description FROM channels WHERE description IS NOT NULL LIMIT %s", (limit,))
+            return [row[0] for row in cur.fetchall()]
+    finally:
+        conn.close()
+
+
+def timed(label, fn, corpus, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(corpus)
+        best = min(best, time.perf_counter() - started)
+    per_item_us = best / len(corpus) * 1e6
+    print(f"{label:<28} {best * 1000:9.1f} ms  {per_item_us:8.2f} us/description")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=20000, help="Synthetic descriptions ki ginti")
+    parser.add_argument('--repeat', type=int, default=5, help="Har variant kitni baar chale (best time report hota hai)")
+    parser.add_argument('--from-db', action='store_true', help="channels table se descriptions lo")
+    args = parser.parse_args()
+
+    corpus = db_corpus(args.size) if args.from_db else synthetic_corpus(args.size)
+    print(f"Corpus: {len(corpus)} descriptions, {sum(map(len, corpus)) / 1e6:.1f} MB text\n")
+
+    legacy = timed("legacy (5 scans)", lambda c: [legacy_extract_details(d) for d in c], corpus, args.repeat)
+    single = timed("compiled engine", lambda c: [extract_details(d) for d in c], corpus, args.repeat)
+    bulk = timed("compiled engine, bulk", extract_details_bulk, corpus, args.repeat)
+    print(f"\nSpeedup: engine {legacy / single:.2f}x, bulk {legacy / bulk:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
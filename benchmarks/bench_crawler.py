@@ -0,0 +1,123 @@
+"""
+Crawler ka offline benchmark: find_channels aur update_video_counts ko fake YouTube API
+(benchmarks/fake_youtube.py) aur ek throwaway Postgres ke saath chalata hai, taaki quota kharch
+kiye bina throughput naapa ja sake।
+
+Report: channels/sec, har saved channel par API calls, DB write time aur peak memory।
+
+CHETAVNI: --dsn wale database ki channels, api_cache aur app_state tables khali kar di jaati hain।
+Kabhi bhi production DATABASE_URL na dein।
+
+Usage:
+    python benchmarks/bench_crawler.py --dsn postgresql://localhost/youtubers_bench
+    python benchmarks/bench_crawler.py --dsn ... --limit 2000 --keyword-workers 8 --latency 0.08 --jitter 0.05
+    python benchmarks/bench_crawler.py --dsn ... --quota-failure-rate 0.002 --error-rate 0.01
+"""
+import argparse
+import os
+import resource
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dsn', default=os.getenv('BENCH_DATABASE_URL'),
+                        help="Throwaway Postgres ka DSN (default: BENCH_DATABASE_URL)")
+    parser.add_argument('--category', default='YouTube related', help="Kis category ke keywords search hon")
+    parser.add_argument('--limit', type=int, default=1000, help="find_channels ka max_channels_limit")
+    parser.add_argument('--keyword-workers', type=int, default=None, help="find_channels threads (default: SEARCH_KEYWORD_WORKERS)")
+    parser.add_argument('--video-workers', type=int, default=None, help="update_video_counts threads (default: VIDEO_COUNT_WORKERS)")
+    parser.add_argument('--require-contact', action='store_true', help="Sirf contact wale channels save karein")
+    parser.add_argument('--universe', type=int, default=20000, help="Fake API mein kitne channels hon")
+    parser.add_argument('--pages-per-keyword', type=int, default=5)
+    parser.add_argument('--latency', type=float, default=0.05, help="Har API call ka delay (seconds)")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Latency mein random extra delay (seconds)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="500 backendError wali calls ka hissa")
+    parser.add_argument('--quota-failure-rate', type=float, default=0.0, help="403 quotaExceeded wali calls ka hissa")
+    parser.add_argument('--keys', type=int, default=3, help="Kitni fake API keys")
+    parser.add_argument('--with-cache', action='store_true', help="api_cache chalu rakhein (default: band)")
+    parser.add_argument('--skip-video-counts', action='store_true')
+    return parser.parse_args()
+
+
+def report(label, elapsed, saved, api_calls, db_seconds):
+    rate = saved / elapsed if elapsed else 0
+    per_channel = sum(api_calls.values()) / saved if saved else float('inf')
+    calls = ', '.join(f"{resource}={count}" for resource, count in sorted(api_calls.items()))
+    print(f"\n== {label} ==")
+    print(f"  wall time          {elapsed:9.2f} s")
+    print(f"  channels           {saved:9d}   ({rate:.1f}/s)")
+    print(f"  API calls          {sum(api_calls.values()):9d}   ({per_channel:.2f} per channel; {calls})")
+    print(f"  DB write time      {db_seconds:9.2f} s   ({db_seconds / elapsed * 100 if elapsed else 0:.1f}% of wall time)")
+
+
+def main():
+    args = parse_args()
+    if not args.dsn:
+        sys.exit("ERROR: --dsn ya BENCH_DATABASE_URL dein (ek throwaway database, jiski tables khali ki jayengi)।")
+
+    # App modules settings import ke waqt padhte hain, isliye env pehle set karna zaroori hai
+    os.environ['DATABASE_URL'] = args.dsn
+    os.environ['API_CACHE_ENABLED'] = 'true' if args.with_cache else 'false'
+    os.environ['YOUTUBE_API_KEYS'] = ','.join(f"bench-key-{i:04d}" for i in range(args.keys))
+    os.environ.setdefault('YOUTUBE_DAILY_QUOTA', str(10 ** 9))
+    os.environ.setdefault('YOUTUBE_QUOTA_REFILL_PER_SECOND', str(10 ** 6))
+
+    from fake_youtube import FakeYouTubeAPI
+    from init_db import initialize_database
+    from app.services import db, youtube_clients, youtube_service
+
+    initialize_database()
+    with db.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("TRUNCATE channels, category_stats, api_cache, app_state")
+        conn.commit()
+
+    api = FakeYouTubeAPI(
+        universe_size=args.universe, pages_per_keyword=args.pages_per_keyword, latency=args.latency,
+        latency_jitter=args.jitter, error_rate=args.error_rate, quota_failure_rate=args.quota_failure_rate,
+    )
+    youtube_clients.set_service_factory(api.service_for)
+    print(f"Fake API: {args.universe} channels, latency {args.latency}s (+{args.jitter}s), "
+          f"errors {args.error_rate:.2%}, quota failures {args.quota_failure_rate:.2%}, {args.keys} keys")
+
+    tracemalloc.start()
+
+    started = time.perf_counter()
+    youtube_service.find_channels(args.category, '2000-01-01', 0, 10 ** 12, args.limit, args.require_contact,
+                                  max_workers=args.keyword_workers)
+    elapsed = time.perf_counter() - started
+    with db.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT channel_id FROM channels")
+            channel_ids = [row[0] for row in cur.fetchall()]
+        conn.rollback()
+    search_calls = dict(api.calls)
+    report("find_channels", elapsed, len(channel_ids), search_calls,
+           youtube_service.DB_WRITE_SECONDS.summary(operation='channels_insert')[1])
+
+    if not args.skip_video_counts and channel_ids:
+        api.calls.clear()
+        started = time.perf_counter()
+        youtube_service.update_video_counts(channel_ids, max_workers=args.video_workers)
+        elapsed = time.perf_counter() - started
+        report("update_video_counts", elapsed, len(channel_ids), dict(api.calls),
+               youtube_service.DB_WRITE_SECONDS.summary(operation='video_counts_update')[1])
+
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Linux par ru_maxrss KB mein hota hai
+    max_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"\nPeak Python heap {peak / 1e6:.1f} MB, max RSS {max_rss_mb:.1f} MB")
+    if api.errors:
+        print("Injected errors: " + ', '.join(f"{reason}={count}" for reason, count in sorted(api.errors.items())))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""
+Duration parser aur count_shorts ka check + micro-benchmark।
+
+Pehle known cases chalte hain (PT59S, PT1M, P1DT..., khali aur galat format); koi bhi case galat nikle
+to exit code 1 hota hai, taaki ise CI mein chalaya ja sake। Phir synthetic durations par timing report hoti hai
+(parse_duration ka cache band karke, aur count_shorts poore batches par)।
+
+Usage:
+    python benchmarks/bench_duration.py
+    python benchmarks/bench_duration.py --size 200000 --repeat 7
+    python benchmarks/bench_duration.py --check-only
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.duration import count_shorts, parse_duration
+
+# (duration, seconds)
+VALID_CASES = [
+    ('PT59S', 59),
+    ('PT1M', 60),
+    ('PT3M', 180),
+    ('PT3M1S', 181),
+    ('PT1H2M3S', 3723),
+    ('PT45.5S', 45.5),
+    ('PT0,5S', 0.5),
+    ('P0D', 0),
+    ('PT0S', 0),
+    ('P1D', 86400),
+    ('P1DT2H', 93600),
+    ('P1DT1M1S', 86461),
+    ('P1W', 7 * 86400),
+    ('P1M', 30 * 86400),
+]
+INVALID_CASES = ['', None, 'P', 'PT', 'T1M', '1M', 'pt1m', 'PTM', 'PT1', 'PT1S2', 'PT1X', 'P1H', 'PT1T1M', 'PT.5S', 'PT1.2.3S']
+
+# (durations, threshold, (shorts, long)) - jo parse na ho woh long gina jata hai
+COUNT_CASES = [
+    ([], None, (0, 0)),
+    (['PT59S', 'PT1M', 'PT3M', 'PT3M1S'], 180, (3, 1)),
+    (['PT59S', 'PT1M'], 59, (1, 1)),
+    (['P0D', 'PT0S'], 180, (0, 2)),
+    (['P1DT2H', 'PT30S'], 180, (1, 1)),
+    (['', 'garbage', None, 'PT10S'], 180, (1, 3)),
+]
+
+SAMPLE_DURATIONS = ['PT{s}S', 'PT{m}M{s}S', 'PT{m}M', 'PT{h}H{m}M{s}S', 'P0D', 'PT{s}.{s}S', 'P1DT{h}H']
+
+
+def run_checks():
+    failures = []
+    for value, expected in VALID_CASES:
+        try:
+            got = parse_duration(value)
+        except ValueError as e:
+            failures.append(f"parse_duration({value!r}) ne error diya: {e}")
+            continue
+        if got != expected:
+            failures.append(f"parse_duration({value!r}) = {got!r}, chahiye tha {expected!r}")
+    for value in INVALID_CASES:
+        try:
+            got = parse_duration(value)
+        except ValueError:
+            continue
+        failures.append(f"parse_duration({value!r}) = {got!r}, ValueError chahiye tha")
+    for durations, threshold, expected in COUNT_CASES:
+        got = count_shorts(durations, threshold)
+        if got != expected:
+            failures.append(f"count_shorts({durations!r}, {threshold}) = {got}, chahiye tha {expected}")
+    checked = len(VALID_CASES) + len(INVALID_CASES) + len(COUNT_CASES)
+    return checked, failures
+
+
+def synthetic_durations(size, seed=42):
+    rng = random.Random(seed)
+    return [
+        rng.choice(SAMPLE_DURATIONS).format(h=rng.randint(1, 3), m=rng.randint(1, 59), s=rng.randint(1, 59))
+        for _ in range(size)
+    ]
+
+
+def timed(label, fn, repeat, count):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    print(f"{label:<28} {best * 1000:9.1f} ms  {best / count * 1e6:8.3f} us/duration")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=100000, help="Synthetic durations ki ginti")
+    parser.add_argument('--repeat', type=int, default=5, help="Har variant kitni baar chale (best time report hota hai)")
+    parser.add_argument('--check-only', action='store_true', help="Sirf correctness checks, timing nahi")
+    args = parser.parse_args()
+
+    checked, failures = run_checks()
+    if failures:
+        for failure in failures:
+            print(f"ERROR: {failure}")
+        sys.exit(1)
+    print(f"SUCCESS: {checked} duration cases sahi hain।")
+    if args.check_only:
+        return
+
+    durations = synthetic_durations(args.size)
+    batches = [durations[i:i + 50] for i in range(0, len(durations), 50)]
+    print(f"\nCorpus: {len(durations)} durations, {len(set(durations))} unique\n")
+    uncached = parse_duration.__wrapped__
+    timed("parse_duration (no cache)", lambda: [uncached(d) for d in durations], args.repeat, len(durations))
+    parse_duration.cache_clear()
+    timed("parse_duration (cached)", lambda: [parse_duration(d) for d in durations], args.repeat, len(durations))
+    timed("count_shorts (50/batch)", lambda: [count_shorts(batch) for batch in batches], args.repeat, len(durations))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,236 @@
+"""
+YouTube Data API v3 ka local stand-in (sirf benchmarks ke liye)।
+
+`googleapiclient` ke `youtube` resource jaisa hi interface deta hai:
+    service.search().list(**params).execute()
+search, channels, playlistItems aur videos ke responses ek tay (seed se bane) channel
+universe se aate hain, aur latency, random errors aur 403 quotaExceeded configure ho sakte hain।
+
+    api = FakeYouTubeAPI(universe_size=5000, latency=0.05, quota_failure_rate=0.001)
+    youtube_clients.set_service_factory(api.service_for)
+"""
+import json
+import random
+import threading
+import time
+import zlib
+from collections import Counter
+from datetime import datetime, timedelta
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+PAGE_SIZE = 50
+# Channel ka n-va video is din se n din baad publish hua maana jata hai
+VIDEO_EPOCH = datetime(2018, 1, 1)
+
+
+def _http_error(status, reason, message):
+    resp = httplib2.Response({'status': status})
+    resp.reason = message
+    content = json.dumps({'error': {'code': status, 'message': message, 'errors': [{'reason': reason}]}})
+    return HttpError(resp, content.encode('utf-8'))
+
+
+class _Request:
+    def __init__(self, api, api_key, resource, params):
+        self._api = api
+        self._api_key = api_key
+        self._resource = resource
+        self._params = params
+
+    def execute(self):
+        return self._api.handle(self._api_key, self._resource, self._params)
+
+
+class _Resource:
+    def __init__(self, api, api_key, resource):
+        self._api = api
+        self._api_key = api_key
+        self._resource = resource
+
+    def list(self, **params):
+        return _Request(self._api, self._api_key, self._resource, params)
+
+
+class _BatchRequest:
+    """googleapiclient ke BatchHttpRequest jaisa: sabhi calls ek hi (fake) round trip mein।"""
+    def __init__(self, api, callback=None):
+        self._api = api
+        self._callback = callback
+        self._requests = []
+
+    def add(self, request, callback=None, request_id=None):
+        self._requests.append((request, callback or self._callback, request_id or str(len(self._requests))))
+
+    def execute(self):
+        self._api.delay()
+        with self._api._lock:
+            self._api.calls['batch'] += 1
+        for request, callback, request_id in self._requests:
+            try:
+                response, exception = self._api.handle(request._api_key, request._resource, request._params, delay=False), None
+            except HttpError as e:
+                response, exception = None, e
+            if callback is not None:
+                callback(request_id, response, exception)
+
+
+class FakeYouTube:
+    """Ek API key ka client (googleapiclient `build('youtube', 'v3', ...)` ki jagah)।"""
+    def __init__(self, api, api_key):
+        self._api = api
+        self._api_key = api_key
+
+    def search(self):
+        return _Resource(self._api, self._api_key, 'search')
+
+    def channels(self):
+        return _Resource(self._api, self._api_key, 'channels')
+
+    def playlistItems(self):
+        return _Resource(self._api, self._api_key, 'playlistItems')
+
+    def videos(self):
+        return _Resource(self._api, self._api_key, 'videos')
+
+    def new_batch_http_request(self, callback=None):
+        return _BatchRequest(self._api, callback)
+
+
+class FakeYouTubeAPI:
+    """
+    Saare fake clients ka shared "server"। `calls` mein resource-wise ginti hoti hai।
+
+    latency / latency_jitter: har call ka delay (seconds)
+    error_rate: itne hisse calls par 500 backendError
+    quota_failure_rate: itne hisse calls par 403 quotaExceeded (key us din ke liye band ho jaati hai)
+    pages_per_keyword: har search query ke kitne pages hon
+    """
+    def __init__(self, universe_size=5000, pages_per_keyword=5, latency=0.0, latency_jitter=0.0,
+                 error_rate=0.0, quota_failure_rate=0.0, contact_rate=0.6, hidden_subs_rate=0.05,
+                 max_videos_per_channel=120, seed=42):
+        self.universe_size = universe_size
+        self.pages_per_keyword = pages_per_keyword
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.quota_failure_rate = quota_failure_rate
+        self.contact_rate = contact_rate
+        self.hidden_subs_rate = hidden_subs_rate
+        self.max_videos_per_channel = max_videos_per_channel
+        self.seed = seed
+        self.calls = Counter()
+        self.errors = Counter()
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+
+    def service_for(self, api_key):
+        return FakeYouTube(self, api_key)
+
+    # --- Deterministic universe ---
+
+    def _channel_id(self, index):
+        return f"UCbench{index:017d}"
+
+    def _channel_index(self, channel_id):
+        try:
+            return int(channel_id[len("UCbench"):])
+        except ValueError:
+            return None
+
+    def _channel(self, index):
+        rng = random.Random(self.seed * 1000003 + index)
+        name = f"Bench Creator {index}"
+        description = "Welcome to my channel! Tech reviews, unboxing aur tips & tricks har hafte. " * rng.randint(1, 4)
+        if rng.random() < self.contact_rate:
+            description += f"\nBusiness enquiries: creator{index}@gmail.com\nInstagram: https://instagram.com/creator{index}"
+        hidden = rng.random() < self.hidden_subs_rate
+        return {
+            'id': self._channel_id(index),
+            'snippet': {
+                'title': name,
+                'description': description,
+                'publishedAt': f"20{rng.randint(10, 24):02d}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T00:00:00Z",
+            },
+            'statistics': {
+                'subscriberCount': str(int(10 ** rng.uniform(2, 7))),
+                'hiddenSubscriberCount': hidden,
+                'videoCount': str(rng.randint(0, self.max_videos_per_channel)),
+            },
+            'contentDetails': {'relatedPlaylists': {'uploads': "UU" + self._channel_id(index)[2:]}},
+        }
+
+    def _video_duration(self, video_id):
+        rng = random.Random(zlib.crc32(video_id.encode()) ^ self.seed)
+        if rng.random() < 0.4:
+            return f"PT{rng.randint(5, 59)}S"
+        return f"PT{rng.randint(3, 59)}M{rng.randint(0, 59)}S"
+
+    # --- Request handling ---
+
+    def delay(self):
+        """Ek round trip ka network delay।"""
+        if self.latency or self.latency_jitter:
+            with self._lock:
+                delay = self.latency + self._rng.uniform(0, self.latency_jitter)
+            time.sleep(delay)
+
+    def handle(self, api_key, resource, params, delay=True):
+        with self._lock:
+            self.calls[resource] += 1
+            roll = self._rng.random()
+        if delay:
+            self.delay()
+        if roll < self.quota_failure_rate:
+            with self._lock:
+                self.errors['quotaExceeded'] += 1
+            raise _http_error(403, 'quotaExceeded', 'The request cannot be completed because you have exceeded your quota.')
+        if roll < self.quota_failure_rate + self.error_rate:
+            with self._lock:
+                self.errors['backendError'] += 1
+            raise _http_error(500, 'backendError', 'Backend Error')
+        return getattr(self, f"_{resource}")(params)
+
+    def _search(self, params):
+        page = int((params.get('pageToken') or 'p0')[1:])
+        rng = random.Random(zlib.crc32(params.get('q', '').encode()) ^ (self.seed + page))
+        indices = [rng.randrange(self.universe_size) for _ in range(min(params.get('maxResults', PAGE_SIZE), PAGE_SIZE))]
+        response = {'items': [{'snippet': {'channelId': self._channel_id(index)}} for index in indices]}
+        if page + 1 < self.pages_per_keyword:
+            response['nextPageToken'] = f"p{page + 1}"
+        return response
+
+    def _channels(self, params):
+        # Asli API ki tarah sirf maange gaye parts lautte hain (`fields` ko nazarandaz kiya jata hai)
+        parts = {'id'} | set(params.get('part', '').split(','))
+        items = []
+        for channel_id in params.get('id', '').split(','):
+            index = self._channel_index(channel_id)
+            if index is not None and 0 <= index < self.universe_size:
+                items.append({key: value for key, value in self._channel(index).items() if key in parts})
+        return {'items': items}
+
+    def _playlistItems(self, params):
+        index = self._channel_index("UC" + params['playlistId'][2:])
+        total = int(self._channel(index)['statistics']['videoCount']) if index is not None else 0
+        page = int((params.get('pageToken') or 'p0')[1:])
+        start = page * PAGE_SIZE
+        items = []
+        for position in range(start, min(start + PAGE_SIZE, total)):
+            # Playlist naye se purane ki taraf: position 0 sabse naya video
+            number = total - position
+            items.append({'contentDetails': {
+                'videoId': f"v{index:06d}{number:04d}",
+                'videoPublishedAt': (VIDEO_EPOCH + timedelta(days=number)).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            }})
+        response = {'items': items}
+        if start + PAGE_SIZE < total:
+            response['nextPageToken'] = f"p{page + 1}"
+        return response
+
+    def _videos(self, params):
+        return {'items': [
+            {'id': video_id, 'contentDetails': {'duration': self._video_duration(video_id)}}
+            for video_id in params.get('id', '').split(',') if video_id
+        ]}
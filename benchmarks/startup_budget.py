@@ -0,0 +1,82 @@
+"""
+Web app ke cold start ka budget check: `create_app()` ek naye Python process mein kitne
+samay aur kitni memory (peak RSS) mein hota hai, aur kahin bhari modules to load nahi hue।
+
+Har run alag subprocess mein hota hai (import cache garam na ho), aur median report hota hai।
+Budget se upar jaane par ya koi worker-only module load hone par exit code 1 hota hai, taaki
+ise CI ya deploy se pehle chalaya ja sake।
+
+Usage:
+    python benchmarks/startup_budget.py
+    python benchmarks/startup_budget.py --runs 7 --max-seconds 0.6 --max-rss-mb 60
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Web process mein inka load hona budget tootna maana jata hai (ye sirf worker ya on-demand hain)
+FORBIDDEN_MODULES = (
+    'googleapiclient', 'httplib2', 'pandas', 'numpy', 'pyarrow', 'init_db',
+    'app.services.youtube_service', 'app.services.youtube_clients',
+)
+
+_PROBE = """
+import json, resource, sys, time
+started = time.perf_counter()
+from app import create_app
+create_app()
+elapsed = time.perf_counter() - started
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+loaded = [name for name in %r if name in sys.modules]
+print(json.dumps({'seconds': elapsed, 'rss_mb': rss_kb / 1024, 'loaded': loaded}))
+""" % (FORBIDDEN_MODULES,)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--max-seconds', type=float, default=float(os.getenv('STARTUP_BUDGET_SECONDS', 1.0)),
+                        help="create_app() tak ka median samay (default: STARTUP_BUDGET_SECONDS ya 1.0)")
+    parser.add_argument('--max-rss-mb', type=float, default=float(os.getenv('STARTUP_BUDGET_RSS_MB', 80)),
+                        help="Peak RSS ki hadd MB mein (default: STARTUP_BUDGET_RSS_MB ya 80)")
+    return parser.parse_args()
+
+
+def probe():
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    output = subprocess.run(
+        [sys.executable, '-c', _PROBE], cwd=ROOT, env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    args = parse_args()
+    results = [probe() for _ in range(max(1, args.runs))]
+    seconds = statistics.median(result['seconds'] for result in results)
+    rss_mb = max(result['rss_mb'] for result in results)
+    loaded = sorted({name for result in results for name in result['loaded']})
+
+    print(f"create_app(): median {seconds * 1000:.0f} ms ({args.runs} runs), peak RSS {rss_mb:.1f} MB")
+    failures = []
+    if seconds > args.max_seconds:
+        failures.append(f"startup {seconds:.3f}s > budget {args.max_seconds}s")
+    if rss_mb > args.max_rss_mb:
+        failures.append(f"RSS {rss_mb:.1f} MB > budget {args.max_rss_mb} MB")
+    if loaded:
+        failures.append(f"web process mein worker-only modules load hue: {', '.join(loaded)}")
+
+    if failures:
+        for failure in failures:
+            print(f"ERROR: {failure}")
+        sys.exit(1)
+    print("SUCCESS: Startup budget ke andar hai।")
+
+
+if __name__ == '__main__':
+    main()
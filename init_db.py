@@ -1,6 +1,8 @@
 import os
 import psycopg2
 from dotenv import load_dotenv
+from app.services.channel_queries import search_index_statements, sort_index_statements
+from app.services.channel_stats import category_stats_statements, refresh_category_stats
 
 # .env फ़ाइल से DATABASE_URL लोड करें
 load_dotenv()
@@ -32,6 +34,13 @@ def initialize_database():
         );
         """,
         """
+        ALTER TABLE channels
+            ADD COLUMN IF NOT EXISTS uploads_playlist_id VARCHAR(255),
+            ADD COLUMN IF NOT EXISTS last_video_id VARCHAR(255),
+            ADD COLUMN IF NOT EXISTS last_video_published_at TIMESTAMP WITH TIME ZONE,
+            ADD COLUMN IF NOT EXISTS description_hash CHAR(32);
+        """,
+        """
         CREATE TABLE IF NOT EXISTS jobs (
             id SERIAL PRIMARY KEY,
             params JSONB,
@@ -42,12 +51,46 @@ def initialize_database():
         );
         """,
         """
+        ALTER TABLE jobs
+            ADD COLUMN IF NOT EXISTS job_type VARCHAR(50),
+            ADD COLUMN IF NOT EXISTS attempts INTEGER NOT NULL DEFAULT 0,
+            ADD COLUMN IF NOT EXISTS max_attempts INTEGER NOT NULL DEFAULT 3,
+            ADD COLUMN IF NOT EXISTS run_after TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            ADD COLUMN IF NOT EXISTS heartbeat_at TIMESTAMP WITH TIME ZONE,
+            ADD COLUMN IF NOT EXISTS worker_id VARCHAR(255),
+            ADD COLUMN IF NOT EXISTS last_error TEXT,
+            ADD COLUMN IF NOT EXISTS checkpoint JSONB,
+            ADD COLUMN IF NOT EXISTS progress JSONB;
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS jobs_pending_idx ON jobs (run_after, id) WHERE status = 'pending';
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS api_cache (
+            cache_key CHAR(64) PRIMARY KEY,
+            resource VARCHAR(50) NOT NULL,
+            payload JSONB NOT NULL,
+            size_bytes INTEGER NOT NULL,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+            expires_at TIMESTAMP WITH TIME ZONE NOT NULL
+        );
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS api_cache_expires_at_idx ON api_cache (expires_at);
+        """,
+        """
         CREATE TABLE IF NOT EXISTS app_state (
             key VARCHAR(255) PRIMARY KEY,
             value TEXT
         );
         """
     )
+    # /results ki keyset pagination ke liye har sort order ka composite index
+    commands += tuple(sort_index_statements())
+    # /results search box ke liye full-text aur trigram indexes
+    commands += tuple(search_index_statements())
+    # Category-wise aggregates ki summary table (/stats aur /results ki category ginti)
+    commands += tuple(category_stats_statements())
     
     conn = None
     try:
@@ -57,6 +100,8 @@ def initialize_database():
         # हर कमांड को चलाएं
         for command in commands:
             cur.execute(command)
+        # Pehle se maujood channels ke liye category_stats poori table se bharein (upgrade ke baad bhi sahi rahe)
+        refresh_category_stats(cur)
         
         # बदलावों को सेव करें
         cur.close()
@@ -0,0 +1,17 @@
+from dotenv import load_dotenv
+import argparse
+
+# Job queue settings environment se padhe jate hain, isliye import se pehle .env load karein
+load_dotenv()
+
+from app.services.job_queue import run_worker_pool, JOB_WORKER_CONCURRENCY
+
+# Background jobs (channel search, video counts) isi process se chalte hain, web workers se nahi
+# Usage: python worker.py --concurrency 4
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="jobs table se jobs uthakar chalane wala worker pool")
+    parser.add_argument('--concurrency', type=int, default=JOB_WORKER_CONCURRENCY,
+                        help="Kitne worker processes ek saath chalein (default: JOB_WORKER_CONCURRENCY)")
+    args = parser.parse_args()
+    run_worker_pool(args.concurrency)